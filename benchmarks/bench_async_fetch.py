@@ -0,0 +1,86 @@
+"""
+Serial requests vs. the asyncio fan-out for API-backed fetches, against a local stub server.
+
+    python -m benchmarks.bench_async_fetch [--queries 300] [--delay 0.05] [--rate 200]
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from websites.reliance.relianceSc_api import RelianceApiScraper, fetch_all, record_name
+from websites.reliance.stub_server import API_PATH
+from scheduler import ScrapeTask
+
+
+def write_pages(directory: str, queries: list):
+    for query in queries:
+        page = {
+            'items': [
+                {'type': 'product', '_custom_json': {'name': f"Apple {query}, Black", 'mrp': '89900', 'offer_price': '79900'}},
+                {'type': 'product', '_custom_json': {'name': f"Apple {query}, White", 'mrp': '89900', 'offer_price': '78900'}},
+            ],
+            'page': {'current': 1, 'has_next': False}
+        }
+        with open(os.path.join(directory, record_name(query, 1)), 'w') as file:
+            json.dump(page, file)
+
+
+def start_stub(directory: str, delay: float):
+    """Runs the stub server in its own process so it doesn't share a GIL with the client being measured."""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    process = subprocess.Popen(
+        [sys.executable, "-m", "websites.reliance.stub_server", directory, str(port), str(delay)],
+        stdout=subprocess.PIPE, text=True
+    )
+    process.stdout.readline() # type: ignore
+    return process, f"http://127.0.0.1:{port}{API_PATH}"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--queries', type=int, default=300)
+    parser.add_argument('--delay', type=float, default=0.05, help="Simulated server latency in seconds.")
+    parser.add_argument('--rate', type=float, default=200, help="Token bucket rate per host.")
+    parser.add_argument('--in-flight', type=int, default=32)
+    parser.add_argument('--skip-serial', action='store_true')
+    args = parser.parse_args()
+
+    queries = [f"iPhone {n} 128 GB" for n in range(args.queries)]
+    tasks = [ScrapeTask('Reliance', query, 'Lucknow', '226030') for query in queries]
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_pages(directory, queries)
+        process, url = start_stub(directory, args.delay)
+        try:
+            if not args.skip_serial:
+                scraper = RelianceApiScraper(api_url=url)
+                start = time.perf_counter()
+                for task in tasks:
+                    scraper.search_product(task.product, task.pincode)
+                serial = time.perf_counter() - start
+                scraper.close()
+                print(f"serial:  {len(tasks)} queries in {serial:.2f}s ({len(tasks) / serial:.1f} q/s)")
+
+            rows = []
+            start = time.perf_counter()
+            counts = asyncio.run(fetch_all(
+                tasks, lambda task, data: rows.extend(data or []), api_url=url,
+                rate_per_host=args.rate, max_in_flight=args.in_flight
+            ))
+            fanned = time.perf_counter() - start
+            print(f"fan-out: {counts['ok']} queries in {fanned:.2f}s ({counts['ok'] / fanned:.1f} q/s), "
+                  f"{counts['failed']} failed, {len(rows)} rows")
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
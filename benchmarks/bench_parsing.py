@@ -0,0 +1,61 @@
+"""
+Parse time per search-results page for every installed HTML parser backend.
+
+'full-doc' is the old approach: the pure-Python html.parser over the whole
+document, with no SoupStrainer.
+
+    python -m benchmarks.bench_parsing [--cards 48] [--repeat 5]
+"""
+import argparse
+import statistics
+import time
+from websites.parsing import available_backends, parse_cards
+from websites.amazon import amazonSc
+from websites.flipkart import flipkartSc
+from websites.croma import cromaSc
+from websites.reliance import relianceSc
+from benchmarks.fixtures import build_page
+
+SPECS = {
+    'Amazon': amazonSc.SELECTORS,
+    'Flipkart': flipkartSc.SELECTORS,
+    'Croma': cromaSc.SELECTORS,
+    'Reliance': relianceSc.SELECTORS,
+}
+
+
+def time_parse(html: str, spec: dict, backend: str, repeat: int) -> tuple:
+    if backend == 'full-doc':
+        spec = {key: value for key, value in spec.items() if key != 'strainer'}
+        backend = 'html.parser'
+    samples = []
+    rows: list = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = parse_cards(html, spec, backend)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples), len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--cards', type=int, default=48)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    backends = ['full-doc'] + available_backends()
+    print(f"{'platform':<10} {'page KB':>8} " + " ".join(f"{backend:>12}" for backend in backends) + "   (ms/page)")
+    for platform, spec in SPECS.items():
+        html = build_page(platform, cards=args.cards)
+        timings = []
+        counts = set()
+        for backend in backends:
+            seconds, rows = time_parse(html, spec, backend, args.repeat)
+            timings.append(seconds * 1000)
+            counts.add(rows)
+        flag = "" if len(counts) == 1 else f"  MISMATCH rows={sorted(counts)}"
+        print(f"{platform:<10} {len(html.encode()) // 1024:>8} " + " ".join(f"{ms:>12.2f}" for ms in timings) + flag)
+
+
+if __name__ == "__main__":
+    main()
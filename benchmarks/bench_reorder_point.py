@@ -0,0 +1,78 @@
+"""
+SKUs/sec for the reorder-point engine over synthetic intermittent demand.
+
+Each SKU orders on a random fraction of days (1-95%), half of them with
+Poisson and half with overdispersed negative-binomial quantities, so the mix
+covers smooth, erratic, intermittent and lumpy profiles. The engine is timed
+on an in-memory frame and, with --csv, on the same data read back from disk
+in chunks, with tracemalloc peak memory for both.
+
+    python -m benchmarks.bench_reorder_point [--skus 1000 10000] [--days 730] [--chunksize 1000000] [--csv]
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from reorder_point.engine import compute_reorder_points
+
+
+def make_demand(skus: int, days: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2022-01-01', periods=days, freq='D')
+    probability = rng.uniform(0.01, 0.95, size=skus)
+    ordered = rng.random((days, skus)) < probability
+    day_index, sku_index = np.nonzero(ordered)
+    quantity = np.where(sku_index % 2 == 0,
+                        rng.poisson(20, size=len(day_index)),
+                        rng.negative_binomial(1, 0.05, size=len(day_index))) + 1
+    return pd.DataFrame({
+        'Date': dates.values[day_index],
+        'sku': np.char.add('sku_', sku_index.astype(str)),
+        'orders': quantity,
+    })
+
+
+def measure(source, chunksize: int) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = compute_reorder_points(source, chunksize=chunksize)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--skus', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--days', type=int, default=730)
+    parser.add_argument('--chunksize', type=int, default=1_000_000)
+    parser.add_argument('--csv', action='store_true', help="Also time chunked reads from a CSV file.")
+    args = parser.parse_args()
+
+    print(f"{'skus':>7} {'rows':>10} {'source':>7} {'seconds':>8} {'skus/s':>9} {'rows/s':>10} {'peak MB':>8}  categories")
+    for skus in args.skus:
+        demand = make_demand(skus, args.days)
+        sources = [('frame', demand)]
+        path = None
+        if args.csv:
+            handle, path = tempfile.mkstemp(suffix='.csv')
+            os.close(handle)
+            demand.to_csv(path, index=False)
+            sources.append(('csv', path))
+        try:
+            for label, source in sources:
+                result, elapsed, peak = measure(source, args.chunksize)
+                categories = result['category'].value_counts().to_dict()
+                print(f"{skus:>7} {len(demand):>10} {label:>7} {elapsed:>8.2f} {skus / elapsed:>9.0f} "
+                      f"{len(demand) / elapsed:>10.0f} {peak / 2**20:>8.1f}  {categories}")
+        finally:
+            if path:
+                os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Offline micro-benchmarks for the parse and clean hot paths of every platform.
+
+Each case is one search-results page: a realistic synthetic page, a large
+synthetic page with thousands of cards, and any recorded pages under
+benchmarks/pages/<platform>/. For each case the suite times parse_cards and
+the platform's clean step, and reports items/sec and tracemalloc peak memory.
+
+Results are compared against benchmarks/baseline.json. The run exits
+non-zero if any stage got slower than the threshold allows, and also if there
+is no baseline to compare against (exit 2), so an unconfigured gate never
+passes silently.
+
+A small corpus is committed so the gate runs on a fresh checkout: one
+sanitized page per platform (result cards and page chrome, inline state
+blanked, no user or location data) and the baseline measured on it. Timings
+are machine-specific; rerun --save-baseline on the machine that runs the gate,
+and whenever a slowdown is intended. benchmarks.record_pages adds or
+refreshes real pages.
+
+    python -m benchmarks.bench_suite --save-baseline      # record on a known-good tree
+    python -m benchmarks.bench_suite                      # compare, fail on regression
+    python -m benchmarks.bench_suite --threshold 0.15 --large-cards 10000
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import tracemalloc
+from websites.parsing import parse_cards, resolve_backend
+from websites.amazon import amazonSc
+from websites.flipkart import flipkartSc
+from websites.croma import cromaSc
+from websites.reliance import relianceSc
+from benchmarks.fixtures import build_page
+from benchmarks.record_pages import PAGES_DIR
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+QUERY = "iPhone 16 128 GB"
+
+PLATFORMS = {
+    'Amazon': (amazonSc, amazonSc.AmazonScraper),
+    'Flipkart': (flipkartSc, flipkartSc.FlipkartScraper),
+    'Croma': (cromaSc, cromaSc.CromaScraper),
+    'Reliance': (relianceSc, relianceSc.RelianceScraper),
+}
+
+
+def load_cases(large_cards: int) -> list:
+    cases = []
+    unrecorded = []
+    for platform in PLATFORMS:
+        cases.append((platform, 'synthetic-48', build_page(platform, cards=48)))
+        cases.append((platform, f'synthetic-{large_cards}', build_page(platform, cards=large_cards, seed=1)))
+        paths = sorted(glob.glob(os.path.join(PAGES_DIR, platform.lower(), '*.html')))
+        if not paths:
+            unrecorded.append(platform)
+        for path in paths:
+            with open(path, encoding='utf-8') as file:
+                cases.append((platform, 'recorded-' + os.path.splitext(os.path.basename(path))[0], file.read()))
+    if unrecorded:
+        print(f"WARNING: no recorded pages for {', '.join(unrecorded)} under {PAGES_DIR}; only synthetic pages "
+              f"are benchmarked. Run `python -m benchmarks.record_pages` to record real ones.", file=sys.stderr)
+    return cases
+
+
+def run_case(platform: str, html: str, backend: str, repeat: int, min_time: float = 0.5) -> dict:
+    module, scraper_class = PLATFORMS[platform]
+    spec = module.SELECTORS
+
+    def parse():
+        return [product for product in map(scraper_class.product_from_fields, parse_cards(html, spec, backend)) if product]
+
+    parse_samples, clean_samples = [], []
+    products: list = []
+    cleaned: list = []
+    # Small pages are repeated until they have run for `min_time`, so their minimum is stable too.
+    deadline = time.perf_counter() + min_time
+    while len(parse_samples) < repeat or time.perf_counter() < deadline:
+        start = time.perf_counter()
+        products = parse()
+        parse_samples.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        cleaned = module.clean(products, QUERY)
+        clean_samples.append(time.perf_counter() - start)
+
+    # Memory is measured in a separate pass; tracemalloc would distort the timings.
+    tracemalloc.start()
+    module.clean(parse(), QUERY)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Best-of-N: the minimum is the least noisy estimate of what the code itself costs.
+    parse_seconds = min(parse_samples)
+    clean_seconds = min(clean_samples)
+    return {
+        'items': len(products),
+        'cleaned': len(cleaned),
+        'parse_ms': parse_seconds * 1000,
+        'clean_ms': clean_seconds * 1000,
+        'parse_items_per_s': len(products) / parse_seconds if parse_seconds else 0.0,
+        'clean_items_per_s': len(products) / clean_seconds if clean_seconds else 0.0,
+        'peak_kb': peak / 1024,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    regressions = []
+    for case, metrics in results.items():
+        previous = baseline.get(case)
+        if not previous:
+            continue
+        for metric in ('parse_ms', 'clean_ms', 'peak_kb'):
+            # Differences under a millisecond are scheduler noise, whatever the percentage.
+            if metric.endswith('_ms') and metrics[metric] - previous[metric] < 1.0:
+                continue
+            if metrics[metric] > previous[metric] * (1 + threshold):
+                regressions.append(f"{case} {metric}: {previous[metric]:.2f} -> {metrics[metric]:.2f} "
+                                   f"(+{(metrics[metric] / previous[metric] - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--backend', default=None, help="HTML parser backend; defaults to HTML_PARSER/auto.")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--large-cards', type=int, default=5000)
+    parser.add_argument('--threshold', type=float, default=0.25, help="Allowed slowdown before failing, as a fraction.")
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--save-baseline', action='store_true')
+    args = parser.parse_args()
+
+    backend = resolve_backend(args.backend)
+    print(f"backend: {backend}")
+    print(f"{'case':<36} {'items':>6} {'parse ms':>10} {'items/s':>10} {'clean ms':>10} {'items/s':>10} {'peak KB':>9}")
+    results = {}
+    cases = load_cases(args.large_cards)
+    for platform, name, html in cases:
+        case = f"{platform}/{name}/{backend}"
+        metrics = run_case(platform, html, backend, args.repeat)
+        results[case] = metrics
+        print(f"{platform + '/' + name:<36} {metrics['items']:>6} {metrics['parse_ms']:>10.2f} "
+              f"{metrics['parse_items_per_s']:>10.0f} {metrics['clean_ms']:>10.2f} "
+              f"{metrics['clean_items_per_s']:>10.0f} {metrics['peak_kb']:>9.0f}")
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as file:
+                baseline = json.load(file)
+        baseline.update(results)
+        with open(args.baseline, 'w') as file:
+            json.dump(baseline, file, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"ERROR: no baseline at {args.baseline}, so nothing was checked. Run with --save-baseline "
+              f"on a known-good tree first.", file=sys.stderr)
+        return 2
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    uncovered = [case for case in results if case not in baseline]
+    if uncovered:
+        print(f"WARNING: {len(uncovered)} case(s) have no baseline and were not checked: "
+              f"{', '.join(uncovered)}. Rerun with --save-baseline to add them.", file=sys.stderr)
+    # A shared machine can swing by tens of percent between runs, so a case only
+    # fails if it is still slower after a second run, keeping each metric's best.
+    for platform, name, html in cases:
+        case = f"{platform}/{name}/{backend}"
+        if compare({case: results[case]}, baseline, args.threshold):
+            print(f"Rerunning {case} to confirm a slowdown")
+            again = run_case(platform, html, backend, args.repeat)
+            results[case] = {metric: min(value, again[metric]) for metric, value in results[case].items()}
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print(f"\nNo regressions beyond {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
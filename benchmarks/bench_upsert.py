@@ -0,0 +1,80 @@
+"""
+Rows/sec for DataAggregator.upsert_rows against a real MySQL/MariaDB.
+
+Uses the DB_* settings from .env and a scratch copy of the products table
+(`products_bench`, created LIKE products and dropped afterwards). Each size
+is written twice: a cold pass that inserts everything, then a rerun of the
+same day that exercises the ON DUPLICATE KEY UPDATE path.
+
+    python -m benchmarks.bench_upsert [--rows 10000 100000 1000000] [--chunks 250 1000 5000]
+"""
+import argparse
+import logging
+import os
+import random
+import time
+from datetime import date
+from dotenv import load_dotenv
+import pymysql
+from dataAggregator import DataAggregator
+
+TABLE = 'products_bench'
+
+
+def make_rows(count: int, seed: int = 0, price_jitter: bool = False) -> list:
+    rng = random.Random(seed)
+    today = date.today()
+    cities = [(f"City{n}", f"{110000 + n}") for n in range(50)]
+    rows = []
+    for index in range(count):
+        city, pincode = cities[index % len(cities)]
+        price = 70000 + (index * 37) % 30000
+        if price_jitter and rng.random() < 0.5:
+            price += 100
+        rows.append((f"iPhone {index // len(cities)} 128 GB", price, 'Bench', pincode, city, today))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--chunks', type=int, nargs='+', default=[250, 1000, 5000])
+    args = parser.parse_args()
+
+    load_dotenv()
+    db_config = {
+        'host': os.getenv('DB_HOST'),
+        'user': os.getenv('DB_USER'),
+        'password': os.getenv('DB_PASSWORD'),
+        'database': os.getenv('DB_NAME'),
+    }
+    logger = logging.getLogger('bench_upsert')
+    aggregator = DataAggregator(db_config, {}, logger, pool_size=1)
+    aggregator.setup_database()
+
+    print(f"{'rows':>9} {'chunk':>6} {'pass':>7} {'seconds':>8} {'rows/s':>9}  counts")
+    try:
+        for count in args.rows:
+            for chunk_size in args.chunks:
+                with aggregator.pool.connection() as conn:
+                    with conn.cursor() as cursor:
+                        cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+                        cursor.execute(f"CREATE TABLE {TABLE} LIKE products")
+                    conn.commit()
+                for label, rows in (('insert', make_rows(count)), ('rerun', make_rows(count, price_jitter=True))):
+                    start = time.perf_counter()
+                    counts = aggregator.upsert_rows(rows, chunk_size=chunk_size, table=TABLE)
+                    elapsed = time.perf_counter() - start
+                    print(f"{count:>9} {chunk_size:>6} {label:>7} {elapsed:>8.2f} {count / elapsed:>9.0f}  {counts}")
+    except pymysql.MySQLError as e:
+        print(f"Database error: {e}")
+    finally:
+        with aggregator.pool.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+            conn.commit()
+        aggregator.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Synthetic search-result pages shaped like each platform's markup.
+
+The card markup mirrors the selectors in each scraper's SELECTORS spec (and
+the legacy BeautifulSoup lookups), wrapped in enough unrelated page chrome to
+make full-document parses realistically expensive.
+"""
+import random
+
+MODELS = ["iPhone 16", "iPhone 16 Plus", "iPhone 16 Pro", "iPhone 15", "iPhone 15 Plus"]
+STORAGES = [128, 256, 512]
+COLOURS = ["Black", "White", "Pink", "Teal", "Ultramarine"]
+
+
+def _product(rng: random.Random) -> tuple:
+    model = rng.choice(MODELS)
+    storage = rng.choice(STORAGES)
+    colour = rng.choice(COLOURS)
+    price = 69900 + 10000 * STORAGES.index(storage) + rng.randrange(0, 5000, 100)
+    return model, storage, colour, price
+
+
+def _amazon_card(rng: random.Random, index: int, sponsored: bool) -> str:
+    model, storage, colour, price = _product(rng)
+    badge = '<span class="puis-label-popover"><span>Sponsored</span></span>' if sponsored else ''
+    return (
+        f'<div data-component-type="s-search-result" data-asin="B0{index:08d}" class="s-result-item">'
+        f'<div class="puis-card-container">{badge}'
+        f'<h2 class="a-size-medium a-spacing-none a-color-base a-text-normal"><span>Apple {model} ({storage} GB) - {colour}</span></h2>'
+        f'<i class="a-icon a-icon-star-small"><span class="a-icon-alt">4.{rng.randint(0, 9)} out of 5 stars</span></i>'
+        f'<span class="a-price"><span class="a-offscreen">₹{price:,}</span><span class="a-price-whole">{price:,}</span></span>'
+        f'</div></div>'
+    )
+
+
+def _flipkart_card(rng: random.Random, index: int, sponsored: bool) -> str:
+    model, storage, colour, price = _product(rng)
+    return (
+        f'<div class="_75nlfW" data-id="MOB{index:010d}"><a class="CGtC98" href="/p/{index}">'
+        f'<div class="KzDlHZ">Apple {model} ({colour}, {storage} GB)</div>'
+        f'<div class="XQDdHH">4.{rng.randint(0, 9)}<img src="star.svg"></div>'
+        f'<div class="Nx9bqj _4b5DiR">₹{price:,}</div>'
+        f'</a></div>'
+    )
+
+
+def _croma_card(rng: random.Random, index: int, sponsored: bool) -> str:
+    model, storage, colour, price = _product(rng)
+    return (
+        f'<li class="product-item"><div class="cp-product typ-plp plp-srp-typ" data-id="{300000 + index}">'
+        f'<h3 class="product-title plp-prod-title 999"><a href="/p/{index}">Apple {model} ({storage}GB, {colour})</a></h3>'
+        f'<div class="new-price plp-srp-new-price-cont"><span class="amount">₹{price:,}</span> <span class="mrp">MRP</span></div>'
+        f'<span class="rating-text">4.{rng.randint(0, 9)}</span>'
+        f'</div></li>'
+    )
+
+
+def _reliance_card(rng: random.Random, index: int, sponsored: bool) -> str:
+    model, storage, colour, price = _product(rng)
+    filled = rng.randint(0, 5)
+    stars = ''.join(
+        f'<svg viewBox="0 0 24 24"><path fill="{"#F7AB20" if star < filled else "#E0E0E0"}" d="M12 2"></path></svg>'
+        for star in range(5)
+    )
+    half = '<img alt="star-half" src="half.svg">' if filled < 5 and rng.random() < 0.3 else ''
+    return (
+        f'<div class="product-card" data-sku="{490000000 + index}">'
+        f'<div class="product-card-title">Apple {model} {storage} GB, {colour}</div>'
+        f'<div class="price">₹{price:,}.00</div>'
+        f'<div class="rating">{stars}{half}</div>'
+        f'</div>'
+    )
+
+
+CARD_BUILDERS = {
+    'Amazon': _amazon_card,
+    'Flipkart': _flipkart_card,
+    'Croma': _croma_card,
+    'Reliance': _reliance_card,
+}
+
+
+def build_page(platform: str, cards: int = 24, seed: int = 0, chrome_blocks: int = 400, sponsored_every: int = 6) -> str:
+    """
+    Returns a full HTML page with `cards` result cards for `platform`.
+
+    `chrome_blocks` controls how much non-result markup (nav, scripts, footer
+    links) surrounds the results; the default gives pages of roughly 100 KB
+    before any cards, in the range of the real sites.
+    """
+    rng = random.Random(seed)
+    build_card = CARD_BUILDERS[platform]
+    chrome = ''.join(
+        f'<div class="nav-item"><a href="/c/{n}"><span class="label">Category {n}</span></a>'
+        f'<ul>{"".join(f"<li><a href=/s/{n}/{m}>Link {m}</a></li>" for m in range(3))}</ul></div>'
+        for n in range(chrome_blocks)
+    )
+    script = '<script>window.__STATE__ = ' + '{"k":"' + 'x' * 2000 + '"};</script>'
+    results = ''.join(
+        build_card(rng, index, sponsored_every > 0 and index % sponsored_every == sponsored_every - 1)
+        for index in range(cards)
+    )
+    return (
+        f'<!DOCTYPE html><html><head><title>{platform} search</title>{script * 5}</head>'
+        f'<body><header>{chrome}</header><main><div id="results">{results}</div></main>'
+        f'<footer>{chrome[: len(chrome) // 2]}</footer></body></html>'
+    )
@@ -0,0 +1,67 @@
+"""
+Records live search-result pages for the offline benchmark corpus.
+
+Saves page_source for each platform into benchmarks/pages/<platform>/<query>.html,
+where bench_suite picks them up next to the synthetic pages.
+
+    python -m benchmarks.record_pages [--server] [--pincode 226030] "iPhone 16 128 GB" ...
+"""
+import argparse
+import os
+import re
+from websites.amazon import amazonSc
+from websites.flipkart import flipkartSc
+from websites.croma import cromaSc
+from websites.reliance import relianceSc
+
+PAGES_DIR = os.path.join(os.path.dirname(__file__), 'pages')
+MODULES = {
+    'Amazon': amazonSc,
+    'Flipkart': flipkartSc,
+    'Croma': cromaSc,
+    'Reliance': relianceSc,
+}
+
+
+def record(platform: str, target_machine: str, pincode: str, queries: list):
+    module = MODULES[platform]
+    scraper = module.get_scraper(target_machine, None)
+    scraper.get_driver()
+    try:
+        if module.LOCATION_AWARE and not scraper.change_location(pincode):
+            print(f"{platform}: location change failed, skipping")
+            return
+        for query in queries:
+            if module.LOCATION_AWARE:
+                scraper.driver.get(scraper.website)
+                scraper.waits.until_ready()
+            if not scraper.search_product(query):
+                print(f"{platform}: search failed for {query}")
+                continue
+            cards = scraper.waits.until_count_stable(module.RESULTS_SELECTOR)
+            directory = os.path.join(PAGES_DIR, platform.lower())
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, re.sub(r'[^a-z0-9]+', '-', query.lower()).strip('-') + '.html')
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(scraper.driver.page_source)
+            print(f"{platform}: saved {cards} cards to {path}")
+    finally:
+        try:
+            scraper.quit()
+        except Exception:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('queries', nargs='+')
+    parser.add_argument('--server', action='store_true', help="Use the headless server driver.")
+    parser.add_argument('--pincode', default='226030')
+    parser.add_argument('--platform', action='append', choices=list(MODULES), help="Repeatable; defaults to all.")
+    args = parser.parse_args()
+    for platform in args.platform or list(MODULES):
+        record(platform, 'server' if args.server else 'local', args.pincode, args.queries)
+
+
+if __name__ == "__main__":
+    main()
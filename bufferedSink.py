@@ -0,0 +1,267 @@
+import json
+import os
+import threading
+import time
+from typing import Callable, Optional
+import logging
+
+
+class BufferedSink:
+    """
+    A write-behind buffer in front of the database.
+
+    Scraping threads `add` rows and return immediately. A background thread
+    hands the buffer to `write` in one large batch whenever `max_rows` rows
+    are waiting or the oldest row is `max_age` seconds old. If `write` fails
+    for any reason, the batch is appended to a local JSONL spool instead, and
+    for the next `retry_interval` seconds batches go straight to the spool
+    without touching the database.
+
+    Callers that need to know when their rows are safe pass `on_durable` to
+    `add`. It is called once the rows have been written or fsync'd to the
+    spool, never while they only sit in memory.
+
+    The spool is replayed, oldest batch first, before anything new is written:
+    on the first flush of the next run, or as soon as the database comes back.
+    `write` must be idempotent (an upsert), because a replay interrupted by a
+    crash or a second outage is simply replayed again from the start.
+
+    Attributes:
+        write (Callable): Writes a list of rows and returns anything loggable (e.g. upsert counts).
+        spool_path (str): Append-only JSONL file holding batches the database refused.
+        max_rows (int): Buffered rows that trigger a flush.
+        max_age (float): Seconds a row may wait in memory before a flush.
+        retry_interval (float): Seconds to spool without trying the database after a failure.
+        logger (logging.Logger): Logger instance for logging messages.
+    """
+    def __init__(self, write: Callable[[list], object], spool_path: str, max_rows: int = 5000, max_age: float = 30,
+                 retry_interval: float = 60, logger: Optional[logging.Logger] = None):
+        self.write = write
+        self.spool_path = spool_path
+        self.max_rows = max(1, max_rows)
+        self.max_age = max_age
+        self.retry_interval = retry_interval
+        self.logger = logger
+        self._buffer: list = []
+        self._callbacks: list = []
+        self._oldest: Optional[float] = None
+        self._retry_at = 0.0
+        self._stalled_until = 0.0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def _replay_path(self) -> str:
+        return self.spool_path + '.replay'
+
+    def start(self):
+        """Starts the background flusher. Spooled batches from earlier runs are replayed on its first flush."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='buffered-sink', daemon=True)
+            self._thread.start()
+
+    def add(self, rows: list, on_durable: Optional[Callable[[], None]] = None):
+        """
+        Queues rows for the next flush. Never blocks on the database.
+
+        `on_durable` is called from the flushing thread once these rows are in the
+        database or in the fsync'd spool. It is not called if both fail.
+        """
+        if not rows:
+            return
+        with self._condition:
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            self._buffer.extend(rows)
+            if on_durable is not None:
+                self._callbacks.append(on_durable)
+            if len(self._buffer) >= self.max_rows:
+                self._condition.notify()
+
+    def pending(self) -> int:
+        """Rows waiting in memory."""
+        with self._condition:
+            return len(self._buffer)
+
+    def _take(self) -> tuple:
+        with self._condition:
+            rows, self._buffer, self._oldest = self._buffer, [], None
+            callbacks, self._callbacks = self._callbacks, []
+        return rows, callbacks
+
+    def _notify(self, callbacks: list):
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f"Durability callback failed: {e}")
+
+    def _requeue(self, rows: list, callbacks: list):
+        """Puts a batch that could be neither written nor spooled back in front of the buffer, for the next flush."""
+        with self._condition:
+            self._buffer[:0] = rows
+            self._callbacks[:0] = callbacks
+            # Hold off for max_age even if the buffer is full, instead of spinning on a broken disk.
+            self._oldest = time.monotonic()
+            self._stalled_until = self._oldest + self.max_age
+
+    def _flush_quietly(self):
+        # Anything escaping here would kill the flusher thread and strand every later row in memory.
+        try:
+            self.flush()
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Buffered sink flush failed: {e}")
+
+    def _run(self):
+        self._flush_quietly()
+        while True:
+            with self._condition:
+                while not self._closed:
+                    stalled = self._stalled_until - time.monotonic()
+                    if stalled > 0:
+                        self._condition.wait(stalled)
+                        continue
+                    if len(self._buffer) >= self.max_rows:
+                        break
+                    if self._oldest is None:
+                        timeout = self.max_age
+                    else:
+                        timeout = self._oldest + self.max_age - time.monotonic()
+                        if timeout <= 0:
+                            break
+                    self._condition.wait(timeout)
+                if self._closed:
+                    return
+            self._flush_quietly()
+
+    def flush(self):
+        """
+        Writes everything buffered, replaying the spool first; spools whatever the database refuses.
+
+        If the spool cannot be written either (full disk, bad path), the batch and
+        its callbacks go back into the buffer and are retried on a later flush.
+        """
+        with self._io_lock:
+            rows, callbacks = self._take()
+            try:
+                if time.monotonic() < self._retry_at:
+                    self._spool(rows)
+                else:
+                    try:
+                        self._replay()
+                        if rows:
+                            result = self.write(rows)
+                            if self.logger:
+                                self.logger.info(f"Flushed {len(rows)} buffered rows: {result}")
+                    except Exception as e:
+                        self._retry_at = time.monotonic() + self.retry_interval
+                        if self.logger:
+                            self.logger.error(f"Database write failed, spooling to {self.spool_path} "
+                                              f"and retrying in {self.retry_interval:.0f}s: {e}")
+                        self._spool(rows)
+            except OSError as e:
+                if self.logger:
+                    self.logger.error(f"Could not spool to {self.spool_path}, keeping {len(rows)} rows in memory: {e}")
+                self._requeue(rows, callbacks)
+                return
+            self._notify(callbacks)
+
+    def _trim_torn_tail(self, path: str):
+        """
+        Cuts an unterminated last line left by a crash mid-append, so the next batch starts on its own line.
+
+        The torn batch was never fsync'd whole, so nobody was told it was durable.
+        """
+        if not os.path.exists(path) or not os.path.getsize(path):
+            return
+        with open(path, 'rb+') as file:
+            file.seek(-1, os.SEEK_END)
+            if file.read(1) == b'\n':
+                return
+            size = end = file.seek(0, os.SEEK_END)
+            position = size
+            while position > 0:
+                start = max(0, position - 65536)
+                file.seek(start)
+                newline = file.read(position - start).rfind(b'\n')
+                if newline >= 0:
+                    end = start + newline + 1
+                    break
+                position = start
+            else:
+                end = 0
+            file.truncate(end)
+            file.flush()
+            os.fsync(file.fileno())
+        if self.logger:
+            self.logger.warning(f"Dropped a torn {size - end}-byte line at the end of {path}.")
+
+    def _spool(self, rows: list):
+        if not rows:
+            return
+        self._trim_torn_tail(self.spool_path)
+        with open(self.spool_path, 'a', encoding='utf-8') as file:
+            # Dates are written as ISO strings, which MySQL accepts for DATE columns on replay.
+            file.write(json.dumps(rows, default=str) + '\n')
+            file.flush()
+            os.fsync(file.fileno())
+        if self.logger:
+            self.logger.warning(f"Spooled {len(rows)} rows to {self.spool_path}.")
+
+    def _read_batches(self, path: str) -> list:
+        batches = []
+        with open(path, encoding='utf-8') as file:
+            for number, line in enumerate(file, 1):
+                try:
+                    batches.append(json.loads(line))
+                except ValueError:
+                    # A line torn by a crash mid-append; only that batch is lost, the rest still replay.
+                    if self.logger:
+                        self.logger.warning(f"Skipping unreadable spool line {number} in {path}.")
+        return batches
+
+    def _replay(self):
+        # A leftover .replay file is a replay that crashed; it is older than the spool, so it goes first.
+        if not os.path.exists(self._replay_path):
+            if not os.path.exists(self.spool_path):
+                return
+            os.replace(self.spool_path, self._replay_path)
+        elif os.path.exists(self.spool_path):
+            self._trim_torn_tail(self._replay_path)
+            with open(self.spool_path, encoding='utf-8') as source, open(self._replay_path, 'a', encoding='utf-8') as target:
+                target.write(source.read())
+            os.remove(self.spool_path)
+
+        batches = self._read_batches(self._replay_path)
+        total = sum(len(batch) for batch in batches)
+        if self.logger and total:
+            self.logger.info(f"Replaying {total} spooled rows from {self.spool_path}.")
+        for index, batch in enumerate(batches):
+            try:
+                self.write(batch)
+            except Exception:
+                # Put the unwritten batches back, in order, ahead of anything spooled later.
+                for remaining in batches[index:]:
+                    self._spool(remaining)
+                os.remove(self._replay_path)
+                raise
+        os.remove(self._replay_path)
+        if self.logger and total:
+            self.logger.info(f"Replayed {total} spooled rows.")
+
+    def close(self):
+        """Stops the flusher and writes (or spools) whatever is still buffered."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._retry_at = 0.0
+        self.flush()
+        if self.pending() and self.logger:
+            self.logger.error(f"Closing with {self.pending()} rows neither written nor spooled")
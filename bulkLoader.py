@@ -0,0 +1,346 @@
+"""
+Bulk loads historical or synthetic price data into the products table.
+
+`DataAggregator.process_platform_data` is sized for a few dozen scraped rows
+per call. Backfills and load tests go through here instead: a CSV or Parquet
+file is streamed in chunks and each chunk is sent with LOAD DATA LOCAL INFILE
+into a staging table and merged from there, or with large multi-row upserts
+where the server does not allow local infile. Parquet needs pyarrow.
+
+    python bulkLoader.py prices.parquet
+    python bulkLoader.py product_pricing_data_monthly.csv --method insert --chunk-rows 50000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import logging
+import numpy as np
+import pandas as pd
+import pymysql
+import timing
+from dataAggregator import DataAggregator, upsert_counts
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+LOAD_COLUMNS = ('title', 'price', 'platform', 'pincode', 'city', 'scrape_date')
+# Column names used by the R export and `dataFabrication.generate_prices(schema="r")`.
+COLUMN_ALIASES = {'product': 'title', 'date': 'scrape_date', 'state': 'city'}
+# Rows per INSERT statement in the fallback path; about 1 MB per statement, well under max_allowed_packet.
+INSERT_CHUNK_SIZE = 5000
+# Local infile refused: 1148 (older servers), 3948 (MySQL 8), 4166 (MariaDB).
+INFILE_DISABLED = (1148, 3948, 4166)
+_TSV_ESCAPES = (('\\', '\\\\'), ('\t', '\\t'), ('\n', '\\n'))
+
+
+def read_chunks(path: str, chunk_rows: int = 200_000):
+    """Yields a CSV (optionally compressed) or Parquet file as DataFrames of at most `chunk_rows` rows."""
+    if path.endswith('.parquet'):
+        if not HAS_PYARROW:
+            raise ImportError("Parquet input needs pyarrow; install it or load a .csv file instead.")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+        return
+    yield from pd.read_csv(path, chunksize=chunk_rows, dtype={'pincode': str})
+
+
+def count_rows(path: str) -> Optional[int]:
+    """Row count from the Parquet footer; None for CSV, which would have to be read twice."""
+    if path.endswith('.parquet') and HAS_PYARROW:
+        return pq.ParquetFile(path).metadata.num_rows
+    return None
+
+
+def products_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Maps a chunk onto the products columns.
+
+    Accepts the products layout itself (as written by `generate_prices(schema="products")`)
+    or the R layout (date, product, platform, state, price). Prices are rounded
+    to whole rupees, dates become YYYY-MM-DD and a missing pincode is left empty.
+    """
+    frame = frame.rename(columns={alias: name for alias, name in COLUMN_ALIASES.items()
+                                  if alias in frame and name not in frame})
+    missing = [name for name in LOAD_COLUMNS if name != 'pincode' and name not in frame]
+    if missing:
+        raise ValueError(f"Missing columns for {', '.join(LOAD_COLUMNS)}: {', '.join(missing)}")
+    pincode = frame['pincode'].fillna('').astype(str) if 'pincode' in frame else np.full(len(frame), '', dtype=object)
+    return pd.DataFrame({
+        'title': frame['title'].astype(str).values,
+        'price': pd.to_numeric(frame['price']).round().astype(np.int64).values,
+        'platform': frame['platform'].astype(str).values,
+        'pincode': np.asarray(pincode, dtype=object),
+        'city': frame['city'].astype(str).values,
+        'scrape_date': pd.to_datetime(frame['scrape_date']).values.astype('datetime64[D]').astype(str).astype(object),
+    })
+
+
+def to_tsv(frame: pd.DataFrame) -> bytes:
+    """Encodes a products frame in LOAD DATA's default text format: tab-separated, backslash-escaped, one row per line."""
+    columns = {}
+    for name in LOAD_COLUMNS:
+        values = frame[name]
+        if pd.api.types.is_string_dtype(values):
+            # Titles, platforms and cities repeat a lot, so checking the distinct values is cheap.
+            if any(char in value for value in pd.unique(values) for char in '\\\t\n'):
+                for raw, escaped in _TSV_ESCAPES:
+                    values = values.str.replace(raw, escaped, regex=False)
+        columns[name] = values
+    frame = pd.DataFrame(columns)
+    if HAS_PYARROW:
+        sink = pa.BufferOutputStream()
+        try:
+            pacsv.write_csv(pa.Table.from_pandas(frame, preserve_index=False), sink,
+                            pacsv.WriteOptions(include_header=False, delimiter='\t', quoting_style='none'))
+            return sink.getvalue().to_pybytes()
+        except pa.ArrowInvalid:
+            # Arrow refuses unquoted values with a double quote in them; LOAD DATA does not mind.
+            pass
+    fields = [list(map(str, frame[name].tolist())) for name in LOAD_COLUMNS]
+    return ''.join(line + '\n' for line in map('\t'.join, zip(*fields))).encode('utf-8')
+
+
+def to_rows(frame: pd.DataFrame) -> list:
+    """(title, price, platform, pincode, city, scrape_date) tuples of plain Python values, as `upsert_rows` takes them."""
+    return list(zip(*(frame[name].tolist() for name in LOAD_COLUMNS)))
+
+
+class BulkLoader:
+    """
+    Streams a price file into the products table at bulk-load speed.
+
+    Chunks are read, converted and written to a temporary TSV file on a
+    background thread while the previous chunk is loading, so parsing and the
+    server's work overlap. Each chunk is loaded with LOAD DATA LOCAL INFILE
+    into an unindexed temporary staging table, then merged with
+    INSERT ... SELECT ... ON DUPLICATE KEY UPDATE price, and committed. This
+    is the same upsert `DataAggregator.upsert_rows` does. A rerun therefore
+    keeps existing ids, and the 'updated' and 'unchanged' counts mean the
+    same for both methods.
+
+    method="insert" sends multi-row INSERT ... ON DUPLICATE KEY UPDATE batches
+    through `DataAggregator.upsert_rows` instead. method="auto" starts with
+    LOAD DATA and switches to inserts for the rest of the file if the server
+    or client refuses local infile.
+
+    Foreign key checks are off on the loading connection. Unique checks are
+    turned off only with `assume_unique`, because InnoDB then stops detecting
+    duplicates and a rerun would insert rows twice. `disable_keys` wraps the
+    load in ALTER TABLE ... DISABLE KEYS / ENABLE KEYS. That only defers
+    non-unique indexes on MyISAM and Aria tables. The InnoDB table
+    `setup_database` creates has none, so there it is a no-op and is off by
+    default.
+
+    Attributes:
+        aggregator (DataAggregator): Supplies the database config and the upsert fallback.
+        logger (logging.Logger): Logger instance for progress and errors.
+        table (str): Target table, with the products columns.
+        chunk_rows (int): Rows read and loaded per statement.
+        method (str): 'auto', 'infile' or 'insert'.
+        progress_interval (float): Seconds between progress log lines.
+        disable_keys (bool): Wrap the load in DISABLE KEYS / ENABLE KEYS (MyISAM/Aria secondary indexes only).
+        assume_unique (bool): The file is known to hold no duplicate keys, so unique checks can be skipped.
+        tmp_dir (str): Directory for the per-chunk TSV files; None uses the system default.
+    """
+    def __init__(self, aggregator, logger: Optional[logging.Logger] = None, table: str = 'products',
+                 chunk_rows: int = 200_000, method: str = 'auto', progress_interval: float = 5.0,
+                 disable_keys: bool = False, assume_unique: bool = False, tmp_dir: Optional[str] = None):
+        if method not in ('auto', 'infile', 'insert'):
+            raise ValueError(f"Unknown load method: {method}")
+        self.aggregator = aggregator
+        self.logger = logger
+        self.table = table
+        self.chunk_rows = chunk_rows
+        self.method = method
+        self.progress_interval = progress_interval
+        self.disable_keys = disable_keys
+        self.assume_unique = assume_unique
+        self.tmp_dir = tmp_dir
+
+    @property
+    def _stage(self) -> str:
+        return f"{self.table}_bulk_stage"
+
+    def _connect(self):
+        return pymysql.connect(**{**self.aggregator.db_config, 'local_infile': True})
+
+    def _create_stage(self, conn):
+        """A session-private copy of the target's columns, without its indexes, for LOAD DATA to fill."""
+        columns = ', '.join(LOAD_COLUMNS)
+        with conn.cursor() as cursor:
+            cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS {self._stage}")
+            cursor.execute(f"CREATE TEMPORARY TABLE {self._stage} AS SELECT {columns} FROM {self.table} LIMIT 0")
+
+    def _prepare(self, frames, use_infile: bool):
+        """Reads and converts the next chunk; runs on the writer thread. Returns (frame, tsv_path) or None at the end."""
+        frame = next(frames, None)
+        if frame is None:
+            return None
+        frame = products_frame(frame)
+        if not use_infile:
+            return frame, None
+        handle, path = tempfile.mkstemp(prefix='bulk_', suffix='.tsv', dir=self.tmp_dir)
+        with os.fdopen(handle, 'wb') as file:
+            file.write(to_tsv(frame))
+        return frame, path
+
+    def _load_file(self, conn, path: str, rows: int) -> dict:
+        columns = ', '.join(LOAD_COLUMNS)
+        load = (
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE {self._stage} CHARACTER SET utf8mb4"
+            " FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n'"
+            f" ({columns})"
+        )
+        merge = (
+            f"INSERT INTO {self.table} ({columns}) SELECT {columns} FROM {self._stage}"
+            " ON DUPLICATE KEY UPDATE price = VALUES(price)"
+        )
+        with timing.span('bulk_load', table=self.table, rows=rows):
+            with conn.cursor() as cursor:
+                cursor.execute(f"TRUNCATE TABLE {self._stage}")
+                cursor.execute(load, (path,))
+                affected = cursor.execute(merge)
+            info = getattr(getattr(conn, '_result', None), 'message', None)
+            conn.commit()
+        inserted, updated, unchanged = upsert_counts(rows, affected, info)
+        return {'inserted': inserted, 'updated': updated, 'unchanged': unchanged}
+
+    def _set_keys(self, conn, enabled: bool):
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(f"ALTER TABLE {self.table} {'ENABLE' if enabled else 'DISABLE'} KEYS")
+        except pymysql.MySQLError as e:
+            if self.logger:
+                self.logger.warning(f"Could not {'enable' if enabled else 'disable'} keys on {self.table}: {e}")
+
+    def _progress(self, rows: int, total: Optional[int], started: float, final: bool = False):
+        if not self.logger:
+            return
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        done = f"{rows:,}/{total:,} rows ({rows / total:.0%})" if total else f"{rows:,} rows"
+        self.logger.info(f"{'Loaded' if final else 'Loading'} {self.table}: {done} in {elapsed:.1f}s, {rows / elapsed:,.0f} rows/s")
+
+    def _load_chunk(self, conn, frame: pd.DataFrame, tsv_path: Optional[str], use_infile: bool) -> tuple:
+        """Loads one prepared chunk. Returns (counts, use_infile), the latter False once auto mode has fallen back."""
+        if tsv_path is not None:
+            try:
+                if use_infile:
+                    return self._load_file(conn, tsv_path, len(frame)), True
+            except pymysql.MySQLError as e:
+                if self.method != 'auto' or e.args[0] not in INFILE_DISABLED:
+                    raise
+                conn.rollback()
+                if self.logger:
+                    self.logger.warning(f"LOAD DATA LOCAL INFILE unavailable ({e}); falling back to multi-row inserts.")
+            finally:
+                os.remove(tsv_path)
+        # On the loader's own connection, so the session settings made in `load` apply here too.
+        return self.aggregator.upsert_rows(to_rows(frame), chunk_size=INSERT_CHUNK_SIZE, table=self.table, conn=conn), False
+
+    def load(self, path: str) -> dict:
+        """
+        Loads one CSV or Parquet file.
+
+        Returns:
+            dict: 'rows', 'inserted', 'updated' (price changed), 'unchanged',
+            'seconds', 'rows_per_sec' and the 'method' that was finally used.
+        """
+        stats = {'rows': 0, 'inserted': 0, 'updated': 0, 'unchanged': 0}
+        use_infile = self.method != 'insert'
+        total = count_rows(path)
+        frames = read_chunks(path, self.chunk_rows)
+        started = last_report = time.perf_counter()
+        conn = self._connect()
+        upcoming = None
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SET SESSION foreign_key_checks = 0")
+                if self.assume_unique:
+                    cursor.execute("SET SESSION unique_checks = 0")
+            if use_infile:
+                self._create_stage(conn)
+            if self.disable_keys:
+                self._set_keys(conn, enabled=False)
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix='bulk-loader') as writer:
+                upcoming = writer.submit(self._prepare, frames, use_infile)
+                while True:
+                    prepared = upcoming.result()
+                    if prepared is None:
+                        break
+                    upcoming = writer.submit(self._prepare, frames, use_infile)
+                    counts, use_infile = self._load_chunk(conn, *prepared, use_infile)
+                    stats['rows'] += len(prepared[0])
+                    for name, value in counts.items():
+                        stats[name] += value
+                    if time.perf_counter() - last_report >= self.progress_interval:
+                        last_report = time.perf_counter()
+                        self._progress(stats['rows'], total, started)
+        finally:
+            # After a failure the writer may already have prepared the next chunk's file.
+            if upcoming is not None and upcoming.done() and upcoming.exception() is None:
+                leftover = upcoming.result()
+                if leftover and leftover[1] and os.path.exists(leftover[1]):
+                    os.remove(leftover[1])
+            try:
+                if self.disable_keys:
+                    self._set_keys(conn, enabled=True)
+            finally:
+                conn.close()
+        stats['seconds'] = time.perf_counter() - started
+        stats['rows_per_sec'] = stats['rows'] / max(stats['seconds'], 1e-9)
+        stats['method'] = 'infile' if use_infile else 'insert'
+        self._progress(stats['rows'], total, started, final=True)
+        return stats
+
+
+def main() -> int:
+    from logger import ExtensiveLogger
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('path', help=".csv (optionally compressed) or .parquet (needs pyarrow), "
+                                     "in the products or the R layout")
+    parser.add_argument('--method', choices=['auto', 'infile', 'insert'], default='auto')
+    parser.add_argument('--chunk-rows', type=int, default=200_000)
+    parser.add_argument('--table', default='products')
+    parser.add_argument('--assume-unique', action='store_true', help="Skip unique checks; only for files with no duplicate keys.")
+    parser.add_argument('--disable-keys', action='store_true',
+                        help="Wrap the load in ALTER TABLE DISABLE/ENABLE KEYS. Only defers non-unique indexes on "
+                             "MyISAM/Aria tables; a no-op on the default InnoDB products table.")
+    args = parser.parse_args()
+
+    logger_wrapper = ExtensiveLogger('bulk_loader.log', max_bytes=10000000, backup_count=3)
+    logger = logger_wrapper.get_logger()
+    db_config = {
+        'host': os.getenv('DB_HOST'),
+        'user': os.getenv('DB_USER'),
+        'password': os.getenv('DB_PASSWORD'),
+        'database': os.getenv('DB_NAME'),
+        'cursorclass': pymysql.cursors.DictCursor
+    }
+    aggregator = DataAggregator(db_config, {}, logger, pool_size=1)
+    try:
+        aggregator.setup_database()
+        loader = BulkLoader(aggregator, logger, table=args.table, chunk_rows=args.chunk_rows, method=args.method,
+                            disable_keys=args.disable_keys, assume_unique=args.assume_unique)
+        stats = loader.load(args.path)
+        logger.info(f"Bulk load finished: {stats}")
+    except (pymysql.MySQLError, ValueError, ImportError, OSError) as e:
+        logger.error(f"Bulk load of {args.path} failed: {e}")
+        return 1
+    finally:
+        aggregator.close()
+        logger_wrapper.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
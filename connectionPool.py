@@ -0,0 +1,133 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Optional
+import logging
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection could be checked out within the timeout."""
+
+
+class ConnectionPool:
+    """
+    A small thread-safe pool of warm database connections.
+
+    Connections are created lazily up to `size`, handed out most-recently-used
+    first, and health-checked with `ping(reconnect=True)` before reuse if they
+    have been idle longer than `ping_interval` seconds. A connection whose
+    transaction fails is rolled back, and discarded if even that fails.
+
+    Attributes:
+        connect (Callable): Zero-argument factory returning a new DB-API connection (pymysql or a stand-in).
+        size (int): Maximum number of open connections.
+        timeout (float): Seconds to wait for a free connection before raising PoolTimeout.
+        ping_interval (float): Idle seconds after which a connection is pinged before reuse.
+        logger (logging.Logger): Logger instance for logging messages.
+    """
+    def __init__(self, connect: Callable, size: int = 4, timeout: float = 30, ping_interval: float = 30,
+                 logger: Optional[logging.Logger] = None):
+        self.connect = connect
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+        self.logger = logger
+        self._idle: deque = deque()
+        self._open = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def _create(self):
+        connection = self.connect()
+        if self.logger:
+            self.logger.info("Database connection successful.")
+        return connection
+
+    def _discard(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self._condition:
+            self._open -= 1
+            self._condition.notify()
+
+    def _healthy(self, connection, idle_since: float) -> bool:
+        if time.monotonic() - idle_since < self.ping_interval:
+            return True
+        try:
+            connection.ping(reconnect=True)
+            return True
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f"Dropping unhealthy pooled connection: {e}")
+            return False
+
+    def _checkout(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self._condition:
+                if self._closed:
+                    raise PoolTimeout("Connection pool is closed.")
+                if self._idle:
+                    connection, idle_since = self._idle.pop()
+                elif self._open < self.size:
+                    self._open += 1
+                    connection, idle_since = None, 0.0
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self._condition.wait(remaining):
+                        raise PoolTimeout(f"No database connection free after {self.timeout}s.")
+                    continue
+            if connection is None:
+                try:
+                    return self._create()
+                except Exception:
+                    with self._condition:
+                        self._open -= 1
+                        self._condition.notify()
+                    raise
+            if self._healthy(connection, idle_since):
+                return connection
+            self._discard(connection)
+
+    def _release(self, connection):
+        with self._condition:
+            if self._closed:
+                self._open -= 1
+            else:
+                self._idle.append((connection, time.monotonic()))
+                self._condition.notify()
+                return
+        connection.close()
+
+    @contextmanager
+    def connection(self):
+        """Checks out a connection for the duration of the block."""
+        connection = self._checkout()
+        try:
+            yield connection
+        except Exception:
+            try:
+                connection.rollback()
+            except Exception:
+                self._discard(connection)
+                raise
+            self._release(connection)
+            raise
+        self._release(connection)
+
+    def close(self):
+        """Closes every idle connection; connections still checked out are closed on release."""
+        with self._condition:
+            self._closed = True
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            self._open -= len(idle)
+            self._condition.notify_all()
+        for connection in idle:
+            try:
+                connection.close()
+            except Exception:
+                pass
@@ -2,16 +2,69 @@ from dotenv import load_dotenv
 import yaml
 from logger import ExtensiveLogger
 import os
+import asyncio
 import sys
-import smtplib
-from email.mime.text import MIMEText
+import time
+import re
 import pymysql
-from datetime import date
+from contextlib import nullcontext
+from datetime import date, timedelta
+from connectionPool import ConnectionPool, PoolTimeout
+from bufferedSink import BufferedSink
+from digestNotifier import DigestNotifier
+from locationPolicy import LocationPolicy
+from taskJournal import TaskJournal
+import timing
 load_dotenv()
 from websites.amazon import amazonSc
 from websites.croma import cromaSc
 from websites.flipkart import flipkartSc
-from websites.reliance import relianceSc
+from websites.reliance import relianceSc, relianceSc_api
+from scheduler import CrawlScheduler, ScrapeTask, TaskGroup, build_tasks, drop_fresh, group_tasks, DEFAULT_PLATFORM_LIMITS
+from websites.session import SessionPool
+
+PLATFORM_MODULES = {
+    'Amazon': amazonSc,
+    'Flipkart': flipkartSc,
+    'Croma': cromaSc,
+    'Reliance': relianceSc,
+}
+PLATFORM_NAMES = {
+    'amazon': 'Amazon',
+    'flipkart': 'Flipkart',
+    'croma': 'Croma',
+    'reliance': 'Reliance',
+}
+# Platforms that can also be fetched over plain HTTP instead of a browser session.
+API_MODULES = {
+    'Reliance': relianceSc_api,
+}
+
+
+# Rows per INSERT statement; large enough to amortize round trips, small enough to stay under max_allowed_packet.
+UPSERT_CHUNK_SIZE = int(os.getenv('UPSERT_CHUNK_SIZE', '1000'))
+_DUPLICATES = re.compile(rb'Duplicates:\s*(\d+)')
+
+
+def upsert_counts(rows: int, affected: int, info) -> tuple:
+    """
+    Splits one multi-row upsert into (inserted, updated, unchanged).
+
+    MySQL reports 1 affected row per insert, 2 per changed duplicate and 0 per
+    unchanged one, and the OK packet's info string ("Records: N  Duplicates: D")
+    gives the duplicate count, which together pin down all three.
+    """
+    match = _DUPLICATES.search(info) if isinstance(info, bytes) else None
+    if match:
+        duplicates = int(match.group(1))
+    elif rows == 1:
+        duplicates = 0 if affected == 1 else 1
+    else:
+        # No info string: only duplicates whose price changed are visible.
+        duplicates = max(0, affected - rows)
+    inserted = rows - duplicates
+    updated = max(0, (affected - inserted) // 2)
+    return inserted, updated, duplicates - updated
 
 
 class DataAggregator:
@@ -22,98 +75,202 @@ class DataAggregator:
         db_config (dict): Configuration for the database connection.
         email_config (dict): Configuration for the email notification.
         logger (logging.Logger): Logger instance for logging messages.
+        pool (ConnectionPool): Warm connections shared by every scraping worker.
+        sink (BufferedSink): Write-behind buffer for scraped rows, once `start_sink` has been called.
+        notifier (DigestNotifier): Collects task outcomes and mails them as a digest.
     """
-    def __init__(self, db_config: dict, email_config: dict, logger):
+    def __init__(self, db_config: dict, email_config: dict, logger, pool_size: int = 4, connect=None,
+                 digest_interval=None):
         self.db_config = db_config
         self.email_config = email_config
         self.logger = logger
+        # `connect` lets tests swap in a stand-in for pymysql.connect.
+        self.pool = ConnectionPool(connect or (lambda: pymysql.connect(**self.db_config)), size=pool_size, logger=logger)
+        self.sink = None
+        self.notifier = DigestNotifier(email_config, interval=digest_interval, logger=logger)
+        self.notifier.start()
 
-    def send_email(self, subject, body):
+    def start_sink(self, spool_path: str, max_rows: int = 5000, max_age: float = 30, retry_interval: float = 60):
         """
-        Sends an email notification.
+        Routes `process_platform_data` through a write-behind buffer.
+
+        Rows are upserted in large batches from a background thread; while the
+        database is unreachable they are spooled to `spool_path` and replayed
+        on the next successful flush, in this run or the next.
         """
-        try:
-            msg = MIMEText(body)
-            msg['Subject'] = subject
-            msg['From'] = self.email_config['sender']
-            msg['To'] = self.email_config['recipient']
-
-            with smtplib.SMTP(self.email_config['smtp_server'], self.email_config['smtp_port']) as server:
-                server.starttls()
-                server.login(self.email_config['username'], self.email_config['password'])
-                server.send_message(msg)
-            self.logger.info(f"Email sent successfully: '{subject}'")
-        except Exception as e:
-            self.logger.error(f"Failed to send email. Error: {e}")
-
-    def get_db_connection(self):
-        try:
-            connection = pymysql.connect(**self.db_config)
-            self.logger.info("Database connection successful.")
-            return connection
-        except pymysql.MySQLError as e:
-            self.logger.error(f"Database connection failed: {e}")
-            return None
+        self.sink = BufferedSink(self.upsert_rows, spool_path, max_rows=max_rows, max_age=max_age,
+                                 retry_interval=retry_interval, logger=self.logger)
+        self.sink.start()
 
-    def setup_database(self):
-        conn = self.get_db_connection()
-        if not conn:
-            return
+    def send_email(self, subject, body, platform='all'):
+        """
+        Sends an email notification right away, over the notifier's shared SMTP connection.
+        """
+        return self.notifier.send(subject, body, platform=platform)
 
+    def setup_database(self):
         try:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS products (
-                        id INT AUTO_INCREMENT PRIMARY KEY,
-                        title VARCHAR(255) NOT NULL,
-                        price INT NOT NULL,
-                        platform VARCHAR(50) NOT NULL,
-                        scrape_date DATE NOT NULL,
-                        city VARCHAR(50) NOT NULL,
-                        pincode VARCHAR(10) NOT NULL,
-                        UNIQUE KEY unique_product (title, platform, scrape_date, city, pincode)
-                    )
-                """)
-            conn.commit()
+            with self.pool.connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("""
+                        CREATE TABLE IF NOT EXISTS products (
+                            id INT AUTO_INCREMENT PRIMARY KEY,
+                            title VARCHAR(255) NOT NULL,
+                            price INT NOT NULL,
+                            platform VARCHAR(50) NOT NULL,
+                            scrape_date DATE NOT NULL,
+                            city VARCHAR(50) NOT NULL,
+                            pincode VARCHAR(10) NOT NULL,
+                            UNIQUE KEY unique_product (title, platform, scrape_date, city, pincode)
+                        )
+                    """)
+                conn.commit()
             self.logger.info("Database table 'products' is ready.")
-        except pymysql.MySQLError as e:
+        except (pymysql.MySQLError, PoolTimeout) as e:
             self.logger.error(f"Failed to create or verify table: {e}")
-        finally:
-            conn.close()
 
-    def process_platform_data(self, platform_name, raw_data, pincode, city):
-        self.logger.info(f"Processing data for platform: {platform_name}")
+    def upsert_rows(self, rows: list, chunk_size: int = UPSERT_CHUNK_SIZE, table: str = 'products', conn=None) -> dict:
+        """
+        Writes (title, price, platform, pincode, city, scrape_date) tuples with multi-row
+        INSERT ... ON DUPLICATE KEY UPDATE, one commit per chunk.
+
+        Rerunning a city on the same day overwrites the price instead of failing
+        the whole batch on the unique key. Rows are written one platform at a
+        time so every `db_upsert` timing span is tagged with its platform.
+        Pass `conn` to write on a caller's connection, with its session
+        settings, instead of a pooled one.
+
+        Returns:
+            dict: Counts of 'inserted', 'updated' (price changed) and 'unchanged' rows.
+        """
+        counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        if not rows:
+            return counts
+        by_platform: dict = {}
+        for row in rows:
+            by_platform.setdefault(row[2], []).append(row)
+        chunks = [
+            (platform, platform_rows[start:start + chunk_size])
+            for platform, platform_rows in by_platform.items()
+            for start in range(0, len(platform_rows), chunk_size)
+        ]
+        with nullcontext(conn) if conn is not None else self.pool.connection() as conn:
+            for platform, chunk in chunks:
+                tags = {'platform': platform, 'table': table, 'rows': len(chunk)}
+                cities = {row[4] for row in chunk}
+                if len(cities) == 1:
+                    tags['city'] = cities.pop()
+                query = (
+                    f"INSERT INTO {table} (title, price, platform, pincode, city, scrape_date) VALUES "
+                    + ", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(chunk))
+                    + " ON DUPLICATE KEY UPDATE price = VALUES(price)"
+                )
+                with timing.span('db_upsert', **tags):
+                    with conn.cursor() as cursor:
+                        affected = cursor.execute(query, [value for row in chunk for value in row])
+                    info = getattr(getattr(conn, '_result', None), 'message', None)
+                    conn.commit()
+                inserted, updated, unchanged = upsert_counts(len(chunk), affected, info)
+                counts['inserted'] += inserted
+                counts['updated'] += updated
+                counts['unchanged'] += unchanged
+        return counts
+
+    def fresh_keys(self, platforms: list, ttl_days: int = 0) -> set:
+        """
+        Returns the (platform, title, city) tuples scraped within the last `ttl_days` days.
+
+        ttl_days=0 counts only today's rows as fresh. If the database can't be
+        reached, nothing counts as fresh and everything is scraped again.
+        """
+        if not platforms:
+            return set()
+        since = date.today() - timedelta(days=max(0, ttl_days))
         try:
-            today = date.today()
-            conn = self.get_db_connection()
-            if not raw_data:
-                self.logger.warning(f"No data to process for platform: {platform_name}")
-                return
-            if not conn:
-                self.logger.error("Database connection failed.")
-                return
+            with self.pool.connection() as conn:
+                with conn.cursor(pymysql.cursors.Cursor) as cursor:
+                    cursor.execute(
+                        "SELECT DISTINCT platform, title, city FROM products "
+                        f"WHERE scrape_date >= %s AND platform IN ({', '.join(['%s'] * len(platforms))})",
+                        [since, *platforms]
+                    )
+                    fresh = {tuple(row) for row in cursor.fetchall()}
+        except (pymysql.MySQLError, PoolTimeout) as e:
+            self.logger.error(f"Freshness check failed, scraping everything: {e}")
+            return set()
+        self.logger.info(f"{len(fresh)} (platform, title, city) tuples are fresh since {since}.")
+        return fresh
+
+    def location_stats(self, days: int = 30) -> dict:
+        """
+        Summarizes how prices varied across cities over the last `days` days.
+
+        Returns:
+            dict: Maps each platform to (samples, uniform): the number of (title, day) groups
+            stored for more than one city, and how many of those had a single price.
+        """
+        try:
+            with self.pool.connection() as conn:
+                with conn.cursor(pymysql.cursors.Cursor) as cursor:
+                    cursor.execute("""
+                        SELECT platform, COUNT(*), SUM(prices = 1) FROM (
+                            SELECT platform, COUNT(DISTINCT price) AS prices
+                            FROM products
+                            WHERE scrape_date >= %s
+                            GROUP BY platform, title, scrape_date
+                            HAVING COUNT(DISTINCT city) > 1
+                        ) AS groups_by_day
+                        GROUP BY platform
+                    """, [date.today() - timedelta(days=days)])
+                    return {platform: (int(samples), int(uniform or 0)) for platform, samples, uniform in cursor.fetchall()}
+        except (pymysql.MySQLError, PoolTimeout) as e:
+            self.logger.error(f"Could not read location history: {e}")
+            return {}
+
+    def process_platform_data(self, platform_name, raw_data, pincode, city, product='', seconds=None, fan_out=(),
+                              on_durable=None):
+        """
+        Stores one task's rows under its city and under every (city, pincode) in `fan_out`, as a single batch.
+
+        `on_durable` is called once the batch is upserted or, through the sink, spooled to disk.
+        """
+        self.logger.info(f"Processing data for platform: {platform_name}")
+        outcome = {'platform': platform_name, 'product': product, 'city': city, 'pincode': pincode, 'seconds': seconds}
+        if not raw_data:
+            self.logger.warning(f"No data to process for platform: {platform_name}")
+            self.notifier.record(**outcome, error="no data")
+            return
+        today = date.today()
+        data_to_insert = [
+            (item['title'], item['price'], platform_name, row_pincode, row_city, today)
+            for row_city, row_pincode in [(city, pincode), *fan_out]
+            for item in raw_data
+        ]
+        if self.sink is not None:
+            self.sink.add(data_to_insert, on_durable=on_durable)
+            self.logger.info(f"Queued {len(data_to_insert)} rows for platform {platform_name}.")
+        else:
             try:
-                with conn.cursor() as cursor:
-                    query = """
-                        INSERT INTO products (title, price, platform, pincode, city, scrape_date)
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                    """
-                    data_to_insert = [
-                        (item['title'], item['price'], platform_name,pincode, city, today)
-                        for item in raw_data
-                    ]
-                    cursor.executemany(query, data_to_insert)
-                conn.commit()
-                self.logger.info(f"Data for platform {platform_name} processed successfully.")
-                subject = f"Data processed--{platform_name}--"
-                message = f"Data for platform {platform_name} has been processed successfully."
-                self.send_email(subject, message)
-            except pymysql.MySQLError as e:
+                counts = self.upsert_rows(data_to_insert)
+            except (pymysql.MySQLError, PoolTimeout) as e:
                 self.logger.error(f"Failed to process data for platform {platform_name}: {e}")
-        except pymysql.MySQLError as e:
-            self.logger.error(f"Database connection failed: {e}")
-        finally:
-            conn.close() # type: ignore
+                self.notifier.record(**outcome, rows=len(data_to_insert), error=f"database write failed: {e}")
+                return
+            self.logger.info(
+                f"Data for platform {platform_name} processed successfully: "
+                f"{counts['inserted']} inserted, {counts['updated']} updated, {counts['unchanged']} unchanged."
+            )
+            self.notifier.record(**outcome, rows=len(data_to_insert), counts=counts)
+            if on_durable is not None:
+                on_durable()
+            return
+        self.notifier.record(**outcome, rows=len(data_to_insert))
+
+    def close(self):
+        if self.sink is not None:
+            self.sink.close()
+        self.notifier.close()
+        self.pool.close()
 
 def read_yaml(logger, yaml_file_path: str) -> dict:
     try:
@@ -129,9 +286,13 @@ def read_yaml(logger, yaml_file_path: str) -> dict:
 
 
 if __name__ =="__main__":
+    # --force rescrapes everything, even tuples that already have fresh rows.
+    # --resume continues the last journaled run: finished tasks are skipped, failed ones retried.
+    flags = {arg for arg in sys.argv[1:] if arg.startswith('--')}
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
     to_run = []
-    if len(sys.argv) > 1:
-        _to_run: str = sys.argv[1].strip().lower()
+    if args:
+        _to_run: str = args[0].strip().lower()
 
         if _to_run == 'all':
             to_run = ['amazon', 'flipkart', 'croma']
@@ -142,14 +303,21 @@ if __name__ =="__main__":
                 to_run.append('flipkart')
             if 'croma' in _to_run:
                 to_run.append('croma')
+            if 'reliance' in _to_run:
+                to_run.append('reliance')
     else:
         to_run = ['amazon', 'flipkart', 'croma']
 
     target_machine = str(os.getenv('TARGET_MACHINE'))
-    logger_wrapper = ExtensiveLogger('scraper.log', max_bytes=10000000, backup_count=3)
+    # Log I/O runs on a background listener thread; LOG_QUEUE=0 writes inline, LOG_FORMAT=json writes JSON lines.
+    logger_wrapper = ExtensiveLogger('scraper.log', max_bytes=10000000, backup_count=3,
+                                     use_queue=os.getenv('LOG_QUEUE', '1') != '0',
+                                     json_format=os.getenv('LOG_FORMAT', 'text') == 'json')
     logger = logger_wrapper.get_logger()
     logger.info("Logger initialized.")
     logger.info("This is the first log message.")
+    # Per-stage timing spans as JSON lines; the p50/p95/max summary is logged at the end of the run.
+    spans = timing.configure(os.getenv('TIMING_PATH', 'timings.jsonl'), logger)
 
     __DB_CONFIG = {
             'host': os.getenv('DB_HOST'),
@@ -164,47 +332,122 @@ if __name__ =="__main__":
         'username': os.getenv('FROM_EMAIL'),
         'password': os.getenv('SMTP_PASSWORD'),
         'sender': os.getenv('FROM_EMAIL'),
-        'recipient': os.getenv('TO_EMAIL')
+        'recipient': os.getenv('TO_EMAIL'),
+        # SMTP_STARTTLS=0 for a local debugging server without TLS.
+        'starttls': os.getenv('SMTP_STARTTLS', '1') != '0'
     }
     schema = read_yaml(logger, 'schema.yaml')
     pincodes = schema.get('pincodes', {})
     products = schema.get('products', [])
-    aggregator = DataAggregator(__DB_CONFIG, __EMAIL_SETTINGS, logger)
+    aggregator = DataAggregator(__DB_CONFIG, __EMAIL_SETTINGS, logger, pool_size=int(os.getenv('DB_POOL_SIZE', '4')),
+                                digest_interval=float(os.getenv('DIGEST_INTERVAL')) if os.getenv('DIGEST_INTERVAL') else None)
     aggregator.setup_database()
-    for product in products:
-        flipkart_done: bool = False
-        for city in pincodes:
-            pincode = pincodes[city]
-
-            if target_machine == "local":
-                # Reliance
-                logger.info(f"---Processing product {product} for pincode {pincode} for platform Reliance---")
-                relianceData = relianceSc.run(target_machine, pincode, product, logger) #type: ignore
-                aggregator.process_platform_data("Reliance", relianceData, pincode, city)
-                logger.info("Reliance data processed successfully finished.")
-            else:
-                if 'amazon' in to_run:
-                    # Amazon
-                    logger.info(f"---Processing product {product} for pincode {pincode} for platform Amazon---")
-                    amazonData = amazonSc.run(target_machine, pincode, product, logger)
-                    aggregator.process_platform_data("Amazon", amazonData, pincode, city)
-                    logger.info("Amazon data processed successfully finished.")
-
-
-                # Flipkart
-                if 'flipkart' in to_run:
-                    if flipkart_done is False:
-                        logger.info(f"---Processing product {product} for pincode {pincode} for platform Flipkart---")
-                        flipkartData = flipkartSc.run(target_machine, pincode, product, logger)
-                        aggregator.process_platform_data("Flipkart", flipkartData, pincode, city)
-                        logger.info("Flipkart data processed successfully finished.")
-                        flipkart_done = True
-
-                # Croma
-                if 'croma' in to_run:
-                    logger.info(f"---Processing product {product} for pincode {pincode} for platform Croma---")
-                    cromaData = cromaSc.run(target_machine, pincode, product, logger)
-                    aggregator.process_platform_data("Croma", cromaData, pincode, city)
-                    logger.info("Croma data processed successfully finished.")
+    # Rows are written behind the crawl; an unreachable database spools them locally instead of dropping them.
+    aggregator.start_sink(
+        os.getenv('SPOOL_PATH', 'products.spool.jsonl'),
+        max_rows=int(os.getenv('SINK_MAX_ROWS', '5000')),
+        max_age=float(os.getenv('SINK_MAX_AGE', '30'))
+    )
+
+    if target_machine == "local":
+        platforms = ['Reliance']
+    else:
+        platforms = [PLATFORM_NAMES[name] for name in to_run]
+
+    # RELIANCE_BACKEND=api fetches Reliance from the catalog API instead of driving Chrome.
+    api_platforms = set()
+    if 'Reliance' in platforms and os.getenv('RELIANCE_BACKEND', 'browser').lower() == 'api':
+        api_platforms.add('Reliance')
+
+    # One pool of long-lived browser sessions per platform, sized to the scheduler's limit
+    # so a worker never waits for a session.
+    session_pools = {
+        platform: SessionPool(
+            platform, PLATFORM_MODULES[platform], target_machine,
+            size=DEFAULT_PLATFORM_LIMITS.get(platform, 1),
+            max_tasks=int(os.getenv('SESSION_MAX_TASKS', '20')),
+            logger=logger
+        )
+        for platform in platforms if platform not in api_platforms
+    }
+
+    task_seconds = {}
+
+    def run_group(group: TaskGroup):
+        products_by_name = {task.product: task for task in group.tasks}
+        started = time.monotonic()
+        for product, data in session_pools[group.platform].run_many(group.pincode, list(products_by_name), group.city):
+            task = products_by_name[product]
+            task_seconds[task.key] = time.monotonic() - started
+            yield task, data
+            started = time.monotonic()
+
+    journal = TaskJournal(os.getenv('JOURNAL_PATH', 'crawl_journal.sqlite3'), resume='--resume' in flags, logger=logger)
+
+    handled = set()
+
+    def handle_result(task: ScrapeTask, data):
+        handled.add(task.key)
+        if data is None:
+            # The scrape itself failed (None), as opposed to finding nothing ([]).
+            journal.record(task, False, error="scrape failed")
+            aggregator.notifier.record(task.platform, task.product, task.city, task.pincode,
+                                       seconds=task_seconds.pop(task.key, None), error="scrape failed")
+            return
+        # Scraped rows may sit in the write-behind buffer for a while; the task only counts as done
+        # for --resume once they are upserted or spooled.
+        journal.record(task, bool(data), rows=len(data or []), error=None if data else "no data", durable=False)
+        aggregator.process_platform_data(task.platform, data, task.pincode, task.city,
+                                         product=task.product, seconds=task_seconds.pop(task.key, None),
+                                         fan_out=task.fan_out, on_durable=lambda: journal.mark_done(task))
+
+    # Platforms whose prices don't vary by pincode are scraped once per product and fanned out to every city.
+    # Flipkart can't change location at all, and the Reliance API isn't known to; the rest are judged
+    # on the last LOCATION_HISTORY_DAYS of rows.
+    backends = {**PLATFORM_MODULES, **{platform: API_MODULES[platform] for platform in api_platforms}}
+    policy = LocationPolicy.learn(
+        aggregator.location_stats(int(os.getenv('LOCATION_HISTORY_DAYS', '30'))),
+        fixed={platform for platform, module in backends.items() if not module.LOCATION_AWARE},
+        logger=logger
+    )
+    tasks = build_tasks(products, pincodes, platforms, policy)
+    # Reruns on the same day only scrape what is missing; FRESH_TTL_DAYS widens "fresh" to older rows.
+    if '--force' not in flags and os.getenv('FORCE_SCRAPE', '0') == '0':
+        scheduled = len(tasks)
+        tasks = drop_fresh(tasks, aggregator.fresh_keys(platforms, int(os.getenv('FRESH_TTL_DAYS', '0'))))
+        logger.info(f"Skipping {scheduled - len(tasks)} of {scheduled} tasks that already have fresh rows.")
+    if '--resume' in flags:
+        tasks = journal.pending(tasks, max_attempts=int(os.getenv('RESUME_MAX_ATTEMPTS', '3')))
+    scheduler = CrawlScheduler(
+        {platform: run_group for platform in session_pools},
+        max_workers=int(os.getenv('SCRAPER_WORKERS', '4')),
+        logger=logger
+    )
+    try:
+        # API-backed platforms skip the browser scheduler: every query is fired at once over asyncio.
+        for platform in api_platforms:
+            asyncio.run(API_MODULES[platform].fetch_all(
+                [task for task in tasks if task.platform == platform],
+                handle_result,
+                logger,
+                rate_per_host=float(os.getenv('API_RATE_PER_HOST', '10'))
+            ))
+
+        # 'pincode' sets the location once per city per platform; 'product' is the old product-major order.
+        crawl_order = os.getenv('CRAWL_ORDER', 'pincode')
+        browser_tasks = [task for task in tasks if task.platform in session_pools]
+        results = scheduler.run(group_tasks(browser_tasks, crawl_order), handle_result)
+        for task in browser_tasks:
+            if results.get(task.key, 0) is None and task.key not in handled:
+                journal.record(task, False, error="task failed")
+                aggregator.notifier.record(task.platform, task.product, task.city, task.pincode, error="task failed")
+    finally:
+        for pool in session_pools.values():
+            pool.close()
+        aggregator.close()
+        journal.close()
+        logger.info("Stage timings:\n" + spans.format_summary())
+        spans.close()
 
     logger.info("Finished processing all platforms.")
+    logger_wrapper.shutdown()
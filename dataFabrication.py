@@ -0,0 +1,153 @@
+"""
+Synthetic price history, ported from `Data Fabrication - R/Data Fabrication.r`.
+
+Same platforms, states, products and price rules as the R script, but
+vectorized and streamed: the dates x products x platforms x states grid is
+never materialized. Rows are computed chunk by chunk straight from their grid
+position, so 100M-row datasets take constant memory.
+
+    python dataFabrication.py product_pricing_data_monthly.csv
+    python dataFabrication.py prices.parquet --start 1990-01-01 --freq D --schema products
+"""
+import argparse
+import sys
+from datetime import date
+import numpy as np
+import pandas as pd
+from reorder_point.reorder_point import write_chunks
+
+B2B_PLATFORMS = ["IndiaMart", "Ingram Micro", "Rashi Peripherals"]
+B2C_PLATFORMS = [
+    "Amazon", "Flipkart", "Ebay", "Blinkit", "Reliance Digital",
+    "Vijay Sales", "Apple Store Online", "Croma", "iStore",
+]
+ALL_PLATFORMS = B2B_PLATFORMS + B2C_PLATFORMS
+PREMIUM_PLATFORMS = ["Apple Store Online", "iStore"]
+INDIAN_STATES = [
+    "Andhra Pradesh", "Arunachal Pradesh", "Assam", "Bihar", "Chhattisgarh",
+    "Goa", "Gujarat", "Haryana", "Himachal Pradesh", "Jharkhand", "Karnataka",
+    "Kerala", "Madhya Pradesh", "Maharashtra", "Manipur", "Meghalaya",
+    "Mizoram", "Nagaland", "Odisha", "Punjab", "Rajasthan", "Sikkim",
+    "Tamil Nadu", "Telangana", "Tripura", "Uttar Pradesh", "Uttarakhand",
+    "West Bengal",
+]
+PRODUCTS = {
+    "iphone 16 128 gb": (89900, 94900),
+    "iphone 15 128 gb": (77900, 82900),
+    "macbook air m1 256 gb": (84900, 89900),
+    "macbook pro m1 256 gb": (114900, 119900),
+    "airpods pro 2nd gen": (24900, 26900),
+    "airpods max": (54900, 59900),
+    "apple watch series 9": (41900, 45900),
+}
+# Festival season (Oct-Nov) marks prices up, January and July sales mark them down.
+FESTIVAL_MONTHS = (10, 11)
+SALE_MONTHS = (1, 7)
+
+
+def _uniform_where(rng, mask: np.ndarray, low: float, high: float) -> np.ndarray:
+    """A U(low, high) factor where `mask` is set and 1 elsewhere."""
+    return np.where(mask, rng.uniform(low, high, size=len(mask)), 1.0)
+
+
+def generate_prices(start_date = "2023-01-01", end_date = None, freq = "MS", products = None,
+                    platforms = None, states = None, seed = None, chunk_rows = 1_000_000, schema = "r"):
+    """
+    Yields the price grid as DataFrame chunks of about `chunk_rows` rows.
+
+    Rows follow R's expand.grid order (date varies fastest, then product,
+    platform and state). Each row's price is
+      U(product range) x seasonal factor x platform factor x U(0.995, 1.005),
+    rounded to paise, with the same factors as the R script:
+      - seasonal: U(1.0, 1.5) in Oct/Nov, U(0.7, 0.98) in Jan/Jul, 1 otherwise;
+      - platform: U(0.8, 0.97) for B2B, U(1.0, 1.2) for Apple Store Online/iStore, 1 otherwise.
+
+    `freq` is a pandas frequency. The R script's "MS" (monthly) is the
+    default; "D" gives daily rows for large load tests. `end_date` defaults
+    to today, as Sys.Date() does in R. The same seed and chunk_rows always
+    reproduce the same data.
+
+    schema="r" yields the R columns (date, product, platform, state, price).
+    schema="products" yields rows shaped for the products table: (title,
+    price, platform, pincode, city, scrape_date), with the state as city, a
+    synthetic pincode per state and the price rounded to whole rupees.
+    """
+    products = products or PRODUCTS
+    platforms = np.array(platforms or ALL_PLATFORMS, dtype=object)
+    states = np.array(states or INDIAN_STATES, dtype=object)
+    dates = pd.date_range(start_date, end_date or date.today(), freq=freq)
+    names = np.array(list(products), dtype=object)
+    low = np.array([bounds[0] for bounds in products.values()], dtype=float)
+    high = np.array([bounds[1] for bounds in products.values()], dtype=float)
+    months = dates.month.values
+    is_b2b = np.isin(platforms, B2B_PLATFORMS)
+    is_premium = np.isin(platforms, PREMIUM_PLATFORMS)
+    pincodes = np.array([f"{110001 + index * 7919:06d}" for index in range(len(states))], dtype=object)
+
+    n_dates, n_products, n_platforms = len(dates), len(names), len(platforms)
+    total = n_dates * n_products * n_platforms * len(states)
+    chunk_seeds = np.random.SeedSequence(seed).spawn(-(-total // chunk_rows) if total else 0)
+    for chunk, start in enumerate(range(0, total, chunk_rows)):
+        rng = np.random.default_rng(chunk_seeds[chunk])
+        row = np.arange(start, min(start + chunk_rows, total))
+        date_index = row % n_dates
+        product_index = row // n_dates % n_products
+        platform_index = row // (n_dates * n_products) % n_platforms
+        state_index = row // (n_dates * n_products * n_platforms)
+
+        base = rng.uniform(low[product_index], high[product_index])
+        month = months[date_index]
+        seasonal = np.where(np.isin(month, FESTIVAL_MONTHS), rng.uniform(1.0, 1.5, size=len(row)),
+                            _uniform_where(rng, np.isin(month, SALE_MONTHS), 0.7, 0.98))
+        platform_factor = np.where(is_b2b[platform_index], rng.uniform(0.8, 0.97, size=len(row)),
+                                   _uniform_where(rng, is_premium[platform_index], 1.0, 1.2))
+        variation = rng.uniform(0.995, 1.005, size=len(row))
+        price = np.round(base * seasonal * platform_factor * variation, 2)
+
+        if schema == "products":
+            yield pd.DataFrame({
+                'title': names[product_index],
+                'price': np.round(price).astype(np.int64),
+                'platform': platforms[platform_index],
+                'pincode': pincodes[state_index],
+                'city': states[state_index],
+                'scrape_date': dates.values[date_index].astype('datetime64[D]'),
+            })
+        else:
+            yield pd.DataFrame({
+                'date': dates.values[date_index].astype('datetime64[D]'),
+                'product': names[product_index],
+                'platform': platforms[platform_index],
+                'state': states[state_index],
+                'price': price,
+            })
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('output', nargs='?', default='product_pricing_data_monthly.csv', help=".csv, or .parquet (needs pyarrow)")
+    parser.add_argument('--start', default='2023-01-01')
+    parser.add_argument('--end', default=None)
+    parser.add_argument('--freq', default='MS', help="pandas frequency: MS (monthly, as in R) or D (daily).")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--chunk-rows', type=int, default=1_000_000)
+    parser.add_argument('--schema', choices=['r', 'products'], default='r')
+    args = parser.parse_args()
+
+    written = 0
+
+    def counted(frames):
+        nonlocal written
+        for frame in frames:
+            written += len(frame)
+            print(f"\r{written:,} rows", end='', file=sys.stderr)
+            yield frame
+
+    write_chunks(counted(generate_prices(args.start, args.end, args.freq, seed=args.seed,
+                                         chunk_rows=args.chunk_rows, schema=args.schema)), args.output)
+    print(f"\nWrote {written:,} rows to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
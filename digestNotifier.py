@@ -0,0 +1,191 @@
+import queue
+import smtplib
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from email.mime.text import MIMEText
+from typing import Optional
+import logging
+import timing
+
+_STOP = object()
+
+
+class DigestNotifier:
+    """
+    Collects per-task outcomes on a queue and mails them as one digest.
+
+    `record` only enqueues, so the crawl never waits on SMTP. A background
+    worker aggregates the outcomes and sends a digest when `close` is called,
+    and also every `interval` seconds if an interval is set. All mail goes
+    over a single SMTP connection that is opened on first use. The connection
+    is reopened only if the server has dropped it.
+
+    For local testing, point it at a debugging server with STARTTLS off and no
+    credentials, e.g. `python -m smtpd -n -c DebuggingServer localhost:1025`.
+
+    Attributes:
+        email_config (dict): smtp_server, smtp_port, sender, recipient and optionally
+            username, password and starttls (default True).
+        interval (float): Seconds between digests during a run; None sends a single digest on close.
+        logger (logging.Logger): Logger instance for logging messages.
+    """
+    def __init__(self, email_config: dict, interval: Optional[float] = None, logger: Optional[logging.Logger] = None):
+        self.email_config = email_config
+        self.interval = interval
+        self.logger = logger
+        self._queue: queue.Queue = queue.Queue()
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._smtp_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._reset()
+
+    def _reset(self):
+        self._started = datetime.now()
+        self._stats: dict = defaultdict(lambda: {'tasks': 0, 'rows': 0, 'failed': 0, 'seconds': []})
+        self._failures: list = []
+        self._counts: dict = defaultdict(int)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='digest-notifier', daemon=True)
+            self._thread.start()
+
+    def record(self, platform: str, product: str = '', city: str = '', pincode: str = '', rows: int = 0,
+               seconds: Optional[float] = None, counts: Optional[dict] = None, error: Optional[str] = None):
+        """Queues one task outcome for the next digest. `counts` are write counts such as upsert results."""
+        self._queue.put({
+            'platform': platform, 'product': product, 'city': city, 'pincode': pincode,
+            'rows': rows, 'seconds': seconds, 'counts': counts, 'error': error,
+        })
+
+    def _add(self, outcome: dict):
+        stats = self._stats[outcome['platform']]
+        stats['tasks'] += 1
+        stats['rows'] += outcome['rows']
+        if outcome['seconds'] is not None:
+            stats['seconds'].append(outcome['seconds'])
+        for name, value in (outcome['counts'] or {}).items():
+            self._counts[name] += value
+        if outcome['error']:
+            stats['failed'] += 1
+            self._failures.append(outcome)
+
+    def _run(self):
+        next_digest = time.monotonic() + self.interval if self.interval else None
+        while True:
+            timeout = max(0.0, next_digest - time.monotonic()) if next_digest else None
+            try:
+                outcome = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                outcome = None
+            if outcome is _STOP:
+                return
+            if outcome is not None:
+                self._add(outcome)
+            if next_digest and time.monotonic() >= next_digest:
+                self.send_digest()
+                next_digest = time.monotonic() + self.interval # type: ignore
+
+    def build_digest(self) -> tuple:
+        """Returns (subject, body) summarizing everything recorded since the last digest."""
+        tasks = sum(stats['tasks'] for stats in self._stats.values())
+        rows = sum(stats['rows'] for stats in self._stats.values())
+        elapsed = datetime.now() - self._started
+        subject = f"Scrape digest--{tasks} tasks, {rows} rows, {len(self._failures)} failed--"
+        lines = [
+            f"Period: {self._started:%Y-%m-%d %H:%M:%S} - {datetime.now():%H:%M:%S} ({int(elapsed.total_seconds())}s)",
+            "",
+            f"{'platform':<10} {'tasks':>6} {'rows':>7} {'failed':>7} {'avg s':>7} {'max s':>7}",
+        ]
+        for platform, stats in sorted(self._stats.items()):
+            seconds = stats['seconds']
+            average = f"{sum(seconds) / len(seconds):.1f}" if seconds else '-'
+            longest = f"{max(seconds):.1f}" if seconds else '-'
+            lines.append(f"{platform:<10} {stats['tasks']:>6} {stats['rows']:>7} {stats['failed']:>7} {average:>7} {longest:>7}")
+        if self._counts:
+            lines += ["", "Writes: " + ", ".join(f"{value} {name}" for name, value in sorted(self._counts.items()))]
+        if self._failures:
+            lines += ["", "Failures:"]
+            for failure in self._failures:
+                lines.append(f"  {failure['platform']} '{failure['product']}' in {failure['city']} "
+                             f"({failure['pincode']}): {failure['error']}")
+        return subject, "\n".join(lines)
+
+    def send_digest(self):
+        """Sends the digest for everything recorded so far and starts a new period. Does nothing if empty."""
+        if not self._stats:
+            return
+        subject, body = self.build_digest()
+        self._reset()
+        self.send(subject, body)
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.email_config['smtp_server'], int(self.email_config['smtp_port']), timeout=30)
+        if self.email_config.get('starttls', True):
+            server.starttls()
+        if self.email_config.get('username') and self.email_config.get('password'):
+            server.login(self.email_config['username'], self.email_config['password'])
+        return server
+
+    def _drop(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.close()
+            except Exception:
+                pass
+            self._smtp = None
+
+    def send(self, subject: str, body: str, platform: str = 'all') -> bool:
+        """
+        Sends one mail over the shared connection, reconnecting once if the server dropped it.
+
+        `platform` tags the timing span; digests cover every platform and use 'all'.
+        """
+        msg = MIMEText(body)
+        msg['Subject'] = subject
+        msg['From'] = self.email_config['sender']
+        msg['To'] = self.email_config['recipient']
+        with self._smtp_lock:
+            for attempt in range(2):
+                try:
+                    with timing.span('email', platform=platform):
+                        if self._smtp is None:
+                            self._smtp = self._connect()
+                        self._smtp.send_message(msg)
+                    if self.logger:
+                        self.logger.info(f"Email sent successfully: '{subject}'")
+                    return True
+                except OSError as e:
+                    # SMTPException is an OSError too: drop the connection and try once more on a fresh one.
+                    self._drop()
+                    if attempt and self.logger:
+                        self.logger.error(f"Failed to send email. Error: {e}")
+                except Exception as e:
+                    if self.logger:
+                        self.logger.error(f"Failed to send email. Error: {e}")
+                    return False
+        return False
+
+    def close(self):
+        """Stops the worker, sends the final digest and closes the SMTP connection."""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+        while True:
+            try:
+                outcome = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if outcome is not _STOP:
+                self._add(outcome)
+        self.send_digest()
+        with self._smtp_lock:
+            if self._smtp is not None:
+                try:
+                    self._smtp.quit()
+                except Exception:
+                    pass
+            self._drop()
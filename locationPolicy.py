@@ -0,0 +1,59 @@
+from datetime import date
+from typing import Optional
+import logging
+
+
+class LocationPolicy:
+    """
+    Decides, per platform, whether search results depend on the pincode.
+
+    Location-insensitive platforms are scraped once per product, in the first
+    city, and their rows are fanned out to every other configured city.
+    Learned platforms are also scraped in one rotating probe city, so the
+    history keeps showing whether prices still agree across cities.
+
+    Attributes:
+        insensitive (set): Platforms learned to return the same prices everywhere.
+        fixed (set): Platforms that cannot change location at all; always insensitive, never probed.
+        probe (bool): Whether learned platforms get a rotating second city.
+        logger (logging.Logger): Logger instance for logging messages.
+    """
+    def __init__(self, insensitive: Optional[set] = None, fixed: Optional[set] = None, probe: bool = True,
+                 logger: Optional[logging.Logger] = None):
+        self.insensitive = set(insensitive or ())
+        self.fixed = set(fixed or ())
+        self.probe = probe
+        self.logger = logger
+
+    def is_insensitive(self, platform: str) -> bool:
+        return platform in self.fixed or platform in self.insensitive
+
+    def probe_city(self, platform: str, cities: list, day: Optional[date] = None) -> Optional[str]:
+        """The city (other than the first) an insensitive platform is also scraped in today, if any."""
+        if not self.probe or platform in self.fixed or len(cities) < 2:
+            return None
+        day = day or date.today()
+        return cities[1 + day.toordinal() % (len(cities) - 1)]
+
+    @classmethod
+    def learn(cls, stats: dict, fixed: set, min_samples: int = 20, threshold: float = 0.95, probe: bool = True,
+              logger: Optional[logging.Logger] = None) -> 'LocationPolicy':
+        """
+        Builds a policy from per-platform history.
+
+        `stats` maps a platform to (samples, uniform): the number of (title, day)
+        groups seen in more than one city, and how many of them had a single
+        price across all cities. A platform is insensitive once it has at least
+        `min_samples` groups and at least `threshold` of them were uniform.
+        Anything with less evidence is treated as location-sensitive.
+        """
+        insensitive = set()
+        for platform, (samples, uniform) in stats.items():
+            if platform in fixed:
+                continue
+            if samples >= min_samples and uniform / samples >= threshold:
+                insensitive.add(platform)
+            if logger:
+                verdict = 'insensitive' if platform in insensitive else 'sensitive'
+                logger.info(f"{platform}: {uniform}/{samples} multi-city groups had one price; treating as location-{verdict}.")
+        return cls(insensitive, fixed, probe=probe, logger=logger)
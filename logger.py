@@ -1,10 +1,66 @@
 from io import TextIOWrapper
+import atexit
+import json
 import logging
 import os
 import glob
-from logging.handlers import RotatingFileHandler
+import gzip
+import io
+import queue
+import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from datetime import datetime
 
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+COMPRESSED_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+
+
+def _manifest_path(old_logs_dir: str, log_file_name: str) -> str:
+    return os.path.join(old_logs_dir, f"{log_file_name}.manifest.json")
+
+
+def _open_archive(path: str):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', errors='replace')
+    if path.endswith('.zst'):
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True),
+                                encoding='utf-8', errors='replace')
+    return open(path, encoding='utf-8', errors='replace')
+
+
+def iter_archived_lines(old_logs_dir: str = '.old_logs', log_file_name: str = 'scraper.log', contains=None, pattern=None):
+    """
+    Streams lines from every archived log, oldest first, decompressing on the fly.
+
+    Archives are listed from the retention manifest, so nothing is globbed or
+    stat'ed. Lines can be filtered by a substring (`contains`) and/or a regex
+    (`pattern`); only matching lines are yielded, with their trailing newline removed.
+    """
+    regex = re.compile(pattern) if isinstance(pattern, str) else pattern
+    manifest = _manifest_path(old_logs_dir, log_file_name)
+    if not os.path.exists(manifest):
+        return
+    with open(manifest) as file:
+        entries = json.load(file)
+    for entry in entries:
+        path = os.path.join(old_logs_dir, entry['file'])
+        if not os.path.exists(path):
+            continue
+        with _open_archive(path) as archive:
+            for line in archive:
+                if contains is not None and contains not in line:
+                    continue
+                if regex is not None and not regex.search(line):
+                    continue
+                yield line.rstrip('\n')
+
 class ExtensiveLogger:
     """
     A logger class for extensive logging that manages old log files.
@@ -13,9 +69,15 @@ class ExtensiveLogger:
     certain size. When a rotation occurs, the old log file is moved to
     a '.old_logs' directory. The most recent log file always stays in the
     main directory.
+
+    With use_queue=True the logger itself only puts records on a queue; a
+    background QueueListener thread does the file and console I/O, including
+    rotation, so logging calls never wait on disk. Call `shutdown` (also
+    registered with atexit) to drain the queue before the process exits.
     """
 
-    def __init__(self, log_file_name='app.log', log_dir='.', old_logs_dir='.old_logs', max_bytes=1024*1024, backup_count=5):
+    def __init__(self, log_file_name='app.log', log_dir='.', old_logs_dir='.old_logs', max_bytes=1024*1024, backup_count=5,
+                 use_queue=False, json_format=False, compression='gzip'):
         """
         Initializes the ExtensiveLogger.
 
@@ -25,12 +87,17 @@ class ExtensiveLogger:
             old_logs_dir (str): The directory where old logs will be archived.
             max_bytes (int): The maximum size of the log file in bytes before rotation.
             backup_count (int): The number of backup files to keep.
+            use_queue (bool): Hand records to a background listener thread instead of writing them inline.
+            json_format (bool): Write the log file as JSON lines instead of plain text.
+            compression (str): 'gzip', 'zstd' (falls back to gzip if zstandard is missing) or None
+                to keep rotated logs uncompressed.
         """
         self.log_dir = log_dir
         self.log_file_path = os.path.join(log_dir, log_file_name)
         self.old_logs_path = os.path.join(log_dir, old_logs_dir)
         self.max_bytes = max_bytes
         self.backup_count = backup_count
+        self.listener = None
 
         # Create the directory for old logs if it doesn't exist
         if not os.path.exists(self.old_logs_path):
@@ -45,40 +112,107 @@ class ExtensiveLogger:
             self.log_file_path,
             old_logs_dir=self.old_logs_path,
             maxBytes=self.max_bytes,
-            backupCount=self.backup_count
+            backupCount=self.backup_count,
+            compression=compression
         )
 
         # Create a formatter and set it for the handler
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        if json_format:
+            formatter = self.JsonFormatter()
+        else:
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         self.handler.setFormatter(formatter)
 
         # Add the handler to the logger
         if not self.logger.handlers:
-            self.logger.addHandler(self.handler)
             console_handler = logging.StreamHandler()
             console_handler.setLevel(logging.DEBUG)
             console_formatter = logging.Formatter('%(name)s - %(levelname)s - %(message)s')
             console_handler.setFormatter(console_formatter)
-            self.logger.addHandler(console_handler)
+            if use_queue:
+                log_queue = queue.SimpleQueue()
+                self.listener = QueueListener(log_queue, self.handler, console_handler, respect_handler_level=True)
+                self.listener.start()
+                self.logger.addHandler(QueueHandler(log_queue))
+                atexit.register(self.shutdown)
+            else:
+                self.logger.addHandler(self.handler)
+                self.logger.addHandler(console_handler)
 
     def get_logger(self):
         """Returns the configured logger instance."""
         return self.logger
 
+    def shutdown(self):
+        """
+        Writes out every queued record and stops the listener thread. Safe to call more than once.
+        """
+        if self.listener is not None:
+            # stop() enqueues a sentinel and joins, so everything logged before this call is written.
+            self.listener.stop()
+            self.listener = None
+            for handler in self.logger.handlers[:]:
+                if isinstance(handler, QueueHandler):
+                    self.logger.removeHandler(handler)
+        self.handler.flush()
+
+    class JsonFormatter(logging.Formatter):
+        """
+        Formats each record as one JSON object per line.
+        """
+        def format(self, record):
+            entry = {
+                'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+                'level': record.levelname,
+                'logger': record.name,
+                'thread': record.threadName,
+                'message': record.getMessage(),
+            }
+            if record.exc_info:
+                entry['exception'] = self.formatException(record.exc_info)
+            return json.dumps(entry, default=str)
+
     class CustomRotatingFileHandler(RotatingFileHandler):
         """
         A custom rotating file handler to move old logs to a specific directory.
+
+        Rotated files are compressed on a background thread, and retention is
+        tracked in a JSON manifest next to the archives, so a rollover is only
+        a rename: no compression, globbing or stat calls on the logging path.
         """
-        def __init__(self, filename, old_logs_dir, **kwargs):
+        def __init__(self, filename, old_logs_dir, compression='gzip', **kwargs):
             self.old_logs_dir = old_logs_dir
+            if compression == 'zstd' and not HAS_ZSTD:
+                compression = 'gzip'
+            self.compression = compression
+            self._archiver = ThreadPoolExecutor(max_workers=1, thread_name_prefix='log-archiver')
             super().__init__(filename, **kwargs)
+            self._manifest_file = _manifest_path(old_logs_dir, os.path.basename(self.baseFilename))
+            self._manifest = self._load_manifest()
+
+        def _load_manifest(self) -> list:
+            if os.path.exists(self._manifest_file):
+                with open(self._manifest_file) as file:
+                    return json.load(file)
+            # First run with a manifest: index whatever an older version left behind, once.
+            log_files = glob.glob(os.path.join(self.old_logs_dir, f"{os.path.basename(self.baseFilename)}.*"))
+            log_files = [f for f in log_files if f != self._manifest_file]
+            log_files.sort(key=os.path.getmtime)
+            return [{'file': os.path.basename(f), 'bytes': os.path.getsize(f)} for f in log_files]
+
+        def _save_manifest(self):
+            temporary = self._manifest_file + '.tmp'
+            with open(temporary, 'w') as file:
+                json.dump(self._manifest, file, indent=1)
+            os.replace(temporary, self._manifest_file)
 
         def doRollover(self):
             """
             Performs the log file rollover.
 
             When this method is called, it renames the existing log file with a
-            timestamp and moves it to the '.old_logs' directory.
+            timestamp and moves it to the '.old_logs' directory. Compression and
+            cleanup are handed to the archiver thread.
             """
             if self.stream:
                 self.stream.close()
@@ -87,26 +221,60 @@ class ExtensiveLogger:
             # Generate a timestamped name for the old log file
             timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
             dfn = os.path.join(self.old_logs_dir, f"{os.path.basename(self.baseFilename)}.{timestamp}")
+            # Two rollovers within a second must not overwrite each other.
+            suffix = COMPRESSED_SUFFIXES.get(self.compression, '')
+            candidate, counter = dfn, 1
+            while os.path.exists(candidate) or os.path.exists(candidate + suffix):
+                candidate, counter = f"{dfn}.{counter}", counter + 1
+            dfn = candidate
 
             # Rename the current log file and move it
             if os.path.exists(self.baseFilename):
                 os.rename(self.baseFilename, dfn)
-
-            # Clean up older logs if they exceed the backup count
-            self._cleanup_old_logs()
+                self._archiver.submit(self._archive, dfn)
 
             if not self.delay:
                 self.stream = self._open()
 
+        def _archive(self, path):
+            """Compresses one rotated file, records it in the manifest and enforces the backup count."""
+            try:
+                if self.compression in COMPRESSED_SUFFIXES:
+                    target = path + COMPRESSED_SUFFIXES[self.compression]
+                    with open(path, 'rb') as source:
+                        if self.compression == 'zstd':
+                            with open(target, 'wb') as raw:
+                                zstandard.ZstdCompressor(level=3).copy_stream(source, raw)
+                        else:
+                            with gzip.open(target, 'wb', compresslevel=6) as compressed:
+                                shutil.copyfileobj(source, compressed)
+                    os.remove(path)
+                    path = target
+                self._manifest.append({
+                    'file': os.path.basename(path),
+                    'bytes': os.path.getsize(path),
+                    'rotated': datetime.now().isoformat(timespec='seconds'),
+                })
+                self._cleanup_old_logs()
+                self._save_manifest()
+            except Exception:
+                self.handleError(logging.makeLogRecord({'msg': f"Failed to archive {path}"}))
+
         def _cleanup_old_logs(self):
             """
             Deletes the oldest log files if the number of backups exceeds the limit.
             """
-            log_files = glob.glob(os.path.join(self.old_logs_dir, f"{os.path.basename(self.baseFilename)}.*"))
-            if len(log_files) > self.backupCount:
-                log_files.sort(key=os.path.getmtime)
-                for f in log_files[:-self.backupCount]:
-                    os.remove(f)
+            while len(self._manifest) > self.backupCount:
+                entry = self._manifest.pop(0)
+                try:
+                    os.remove(os.path.join(self.old_logs_dir, entry['file']))
+                except FileNotFoundError:
+                    pass
+
+        def close(self):
+            """Waits for pending archives before closing the file."""
+            self._archiver.shutdown(wait=True)
+            super().close()
 
 
 # --- Example Usage ---
@@ -0,0 +1,198 @@
+from statistics import NormalDist
+import pandas as pd
+import numpy as np
+
+# Syntetos-Boylan cut-offs between smooth, erratic, intermittent and lumpy demand.
+ADI_CUTOFF = 1.32
+CV2_CUTOFF = 0.49
+
+
+class ReorderPointEngine:
+    """
+    Streams daily demand for many SKUs and computes safety stock and reorder points.
+
+    Input is long-format daily demand (date, sku, quantity), such as
+    `lumpy_customer_sales.csv` with one column per role. It is fed in chunks
+    through `update`. Only a fixed set of running sums per SKU is kept, so
+    memory depends on the number of SKUs, not on the length of the history.
+    Chunks must arrive in date order, as the generators in this package write them.
+
+    For every SKU the engine tracks:
+      - the sum and sum of squares of daily demand (days without a row count as zero),
+      - Croston's exponentially smoothed demand size and inter-demand interval.
+
+    Each SKU is classified with the Syntetos-Boylan ADI/CV² scheme. Smooth and
+    erratic SKUs are forecast with their mean daily demand. Intermittent and
+    lumpy SKUs use the Syntetos-Boylan corrected Croston rate,
+    (1 - alpha/2) * size / interval.
+
+    Lead-time demand is rate * L, with standard deviation
+    sqrt(L * var_daily + rate² * lead_time_std²). Safety stock is z * that
+    standard deviation for the target cycle service level, and the reorder
+    point is lead-time demand plus safety stock.
+
+    Attributes:
+        lead_time (float): Replenishment lead time in days.
+        service_level (float): Target cycle service level, e.g. 0.95.
+        alpha (float): Croston smoothing constant.
+        lead_time_std (float): Standard deviation of the lead time in days.
+        date_col (str): Name of the date column.
+        sku_col (str): Name of the SKU column; if it is missing from the input, everything is one SKU.
+        qty_col (str): Name of the quantity column.
+    """
+    def __init__(self, lead_time: float = 7, service_level: float = 0.95, alpha: float = 0.1, lead_time_std: float = 0.0,
+                 date_col: str = 'Date', sku_col: str = 'sku', qty_col: str = 'orders'):
+        self.lead_time = lead_time
+        self.service_level = service_level
+        self.alpha = alpha
+        self.lead_time_std = lead_time_std
+        self.date_col = date_col
+        self.sku_col = sku_col
+        self.qty_col = qty_col
+        self._skus: dict = {}
+        self._state = {name: np.zeros(0) for name in ('total', 'sumsq', 'events', 'size', 'interval', 'last_day')}
+        self._first_day = None
+        self._last_day = None
+        self._held_back = None
+
+    def _codes(self, skus: np.ndarray) -> np.ndarray:
+        """Maps SKU labels to stable integer codes, growing the per-SKU state for new ones."""
+        local, uniques = pd.factorize(skus)
+        mapping = np.array([self._skus.setdefault(sku, len(self._skus)) for sku in uniques], dtype=np.int64)
+        grow = len(self._skus) - len(self._state['total'])
+        if grow > 0:
+            for name, values in self._state.items():
+                fill = np.nan if name in ('size', 'interval', 'last_day') else 0.0
+                self._state[name] = np.concatenate([values, np.full(grow, fill)])
+        return mapping[local]
+
+    def update(self, frame: pd.DataFrame):
+        """Adds one chunk of daily demand. Rows for the chunk's last date are held back until the next chunk."""
+        days = pd.to_datetime(frame[self.date_col]).values.astype('datetime64[D]').astype(np.int64)
+        if self.sku_col in frame:
+            codes = self._codes(frame[self.sku_col].values)
+        else:
+            codes = self._codes(np.full(len(frame), 'all', dtype=object))
+        qty = frame[self.qty_col].values.astype(float)
+        if self._held_back is not None:
+            held_codes, held_days, held_qty = self._held_back
+            codes, days, qty = np.concatenate([held_codes, codes]), np.concatenate([held_days, days]), np.concatenate([held_qty, qty])
+        if not len(days):
+            return
+        # Sort by (sku, day) once; everything below relies on this order.
+        order = np.lexsort((days, codes))
+        codes, days, qty = codes[order], days[order], qty[order]
+        # Several rows for the same SKU and day are one day's demand.
+        boundary = np.ones(len(days), dtype=bool)
+        boundary[1:] = (codes[1:] != codes[:-1]) | (days[1:] != days[:-1])
+        starts = np.flatnonzero(boundary)
+        codes, days, qty = codes[starts], days[starts], np.add.reduceat(qty, starts)
+        # The chunk's last date may continue into the next chunk, so it waits to be complete.
+        last = days.max()
+        held = days == last
+        self._held_back = (codes[held], days[held], qty[held])
+        self._consume(codes[~held], days[~held], qty[~held])
+
+    def _consume(self, codes: np.ndarray, days: np.ndarray, qty: np.ndarray):
+        if not len(days):
+            return
+        first, last = int(days.min()), int(days.max())
+        self._first_day = first if self._first_day is None else min(self._first_day, first)
+        self._last_day = last if self._last_day is None else max(self._last_day, last)
+        state = self._state
+        size = len(state['total'])
+        state['total'] += np.bincount(codes, weights=qty, minlength=size)
+        state['sumsq'] += np.bincount(codes, weights=qty ** 2, minlength=size)
+
+        demand = qty > 0
+        codes, days, qty = codes[demand], days[demand], qty[demand]
+        if not len(days):
+            return
+        counts = np.bincount(codes, minlength=size)
+        # Rows are sorted by (sku, day): a new SKU starts wherever the code changes.
+        first_of_sku = np.ones(len(codes), dtype=bool)
+        first_of_sku[1:] = codes[1:] != codes[:-1]
+        group_start = np.maximum.accumulate(np.where(first_of_sku, np.arange(len(codes)), 0))
+        rank = counts[codes] - 1 - (np.arange(len(codes)) - group_start)
+
+        previous_day = np.empty(len(days))
+        previous_day[1:] = days[:-1]
+        carried_day = state['last_day'][codes[first_of_sku]]
+        # An SKU's first demand ever is measured from the day before the history starts.
+        previous_day[first_of_sku] = np.where(np.isnan(carried_day), self._first_day - 1, carried_day)
+        interval = days - previous_day
+
+        # Croston's recursion s_k = (1-a) s_{k-1} + a x_k, unrolled so each SKU's whole chunk is one weighted sum:
+        # s_m = (1-a)^m s_0 + sum_i a (1-a)^(m-i) x_i. A new SKU starts from its first observation.
+        decay = self.alpha * (1 - self.alpha) ** rank
+        touched = counts > 0
+        carry = (1 - self.alpha) ** counts[touched]
+        for name, values in (('size', qty), ('interval', interval)):
+            start = state[name][touched]
+            firsts = np.full(size, np.nan)
+            firsts[codes[first_of_sku]] = values[first_of_sku]
+            start = np.where(np.isnan(start), firsts[touched], start)
+            state[name][touched] = carry * start + np.bincount(codes, weights=decay * values, minlength=size)[touched]
+        state['events'] += counts
+        last_of_sku = np.append(first_of_sku[1:], True)
+        state['last_day'][codes[last_of_sku]] = days[last_of_sku]
+
+    def result(self) -> pd.DataFrame:
+        """Flushes held-back rows and returns one row per SKU with its demand profile, safety stock and reorder point."""
+        if self._held_back is not None:
+            held, self._held_back = self._held_back, None
+            self._consume(*held)
+        if self._first_day is None:
+            return pd.DataFrame()
+        state = pd.DataFrame(self._state, index=pd.Index(list(self._skus), name='sku'))
+        days = float(self._last_day - self._first_day + 1)
+        total, sumsq, events = state['total'], state['sumsq'], state['events']
+        mean = total / days
+        variance = ((sumsq - total ** 2 / days) / max(days - 1, 1)).clip(lower=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            adi = days / events
+            size_mean = total / events
+            cv2 = (sumsq / events - size_mean ** 2).clip(lower=0) / size_mean ** 2
+        intermittent = adi >= ADI_CUTOFF
+        variable = cv2 >= CV2_CUTOFF
+        category = np.select([~intermittent & ~variable, ~intermittent & variable, intermittent & ~variable],
+                             ['smooth', 'erratic', 'intermittent'], 'lumpy')
+        croston = (1 - self.alpha / 2) * state['size'] / state['interval']
+        rate = pd.Series(np.where(intermittent, croston, mean), index=state.index).fillna(0.0)
+
+        lead_time_demand = rate * self.lead_time
+        lead_time_sigma = np.sqrt(self.lead_time * variance + rate ** 2 * self.lead_time_std ** 2)
+        z = NormalDist().inv_cdf(self.service_level)
+        safety_stock = z * lead_time_sigma
+        result = pd.DataFrame({
+            'days': int(days),
+            'demand_days': events.astype(int),
+            'mean_daily': mean,
+            'std_daily': np.sqrt(variance),
+            'adi': adi,
+            'cv2': cv2,
+            'category': np.where(events > 0, category, 'none'),
+            'rate': rate,
+            'lead_time_demand': lead_time_demand,
+            'lead_time_std': lead_time_sigma,
+            'safety_stock': safety_stock,
+            'reorder_point': lead_time_demand + safety_stock,
+        }, index=state.index)
+        result.index.name = 'sku'
+        return result.reset_index()
+
+
+def compute_reorder_points(source, chunksize: int = 1_000_000, **options) -> pd.DataFrame:
+    """
+    Runs the engine over a DataFrame or a CSV path, reading the file `chunksize` rows at a time.
+
+    `options` are passed to ReorderPointEngine (lead_time, service_level, alpha, column names, ...).
+    """
+    engine = ReorderPointEngine(**options)
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), chunksize):
+            engine.update(source.iloc[start:start + chunksize])
+    else:
+        for chunk in pd.read_csv(source, chunksize=chunksize):
+            engine.update(chunk)
+    return engine.result()
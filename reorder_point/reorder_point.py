@@ -1,46 +1,140 @@
+import os
 import pandas as pd
-import random
 import numpy as np
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+def customer_shares(n_customers: int) -> np.ndarray:
+    """
+    Default order-volume share per customer, proportional to 1/(k+2) for k = 0..n-1.
+
+    For 10 customers this is exactly the original hand-written table
+    (13860/55991, 9240/55991, ..., 2520/55991).
+    """
+    weights = 1.0 / (np.arange(n_customers) + 2)
+    return weights / weights.sum()
+
+
+def generate_orders(
+    N_CUSTOMERS = 10,
+    P_CUSTOMERS = None,
+    TOTAL_MONTHLY_MIN = 1000,
+    TOTAL_MONTHLY_MAX = 1200,
+    N_YEARS = 3,
+    START_DATE = "2022-01-01",
+    seed = None,
+    chunk_rows = 1_000_000
+    ):
+    """
+    Yields every order as DataFrame chunks of (Date, customer_id, orders), a block of months at a time.
+
+    Each month gets a random total in [TOTAL_MONTHLY_MIN, TOTAL_MONTHLY_MAX],
+    split across customers with a multinomial draw over P_CUSTOMERS and
+    rounded down to tens. Customer i always orders on the same day of the
+    month, spread evenly from the 4th to the 28th. A block holds about
+    `chunk_rows` orders, so memory stays bounded whatever the customer count.
+    The same seed gives the same orders for any chunk size.
+    """
+    rng = np.random.default_rng(seed)
+    shares = customer_shares(N_CUSTOMERS) if P_CUSTOMERS is None else np.asarray(P_CUSTOMERS, dtype=float)
+    start = pd.Timestamp(START_DATE)
+    end_date = start + pd.DateOffset(years=N_YEARS) - pd.DateOffset(days=1)
+    months = pd.date_range(start=start, end=end_date, freq='MS')
+    totals = rng.integers(TOTAL_MONTHLY_MIN, TOTAL_MONTHLY_MAX + 1, size=len(months))
+    base_days = np.linspace(4, 28, N_CUSTOMERS).astype(int)
+    customer_ids = np.arange(1, N_CUSTOMERS + 1)
+    month_block = max(1, chunk_rows // max(1, N_CUSTOMERS))
+
+    for first in range(0, len(months), month_block):
+        block = months[first:first + month_block]
+        quantities = rng.multinomial(totals[first:first + month_block], shares) // 10 * 10
+        order_days = np.minimum(base_days[None, :], block.days_in_month.values[:, None])
+        dates = block.values.astype('datetime64[D]')[:, None] + (order_days - 1).astype('timedelta64[D]')
+        yield pd.DataFrame({
+            'Date': dates.ravel(),
+            'customer_id': np.tile(customer_ids, len(block)),
+            'orders': quantities.ravel(),
+        })
+
+
+def write_chunks(frames, path: str):
+    """
+    Streams DataFrame chunks to one CSV or Parquet file (by extension) without holding them all in memory.
+    """
+    if path.endswith('.parquet'):
+        if not HAS_PYARROW:
+            raise ImportError("Parquet output needs pyarrow; install it or write a .csv file instead.")
+        writer = None
+        try:
+            for frame in frames:
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        return
+    if os.path.exists(path):
+        os.remove(path)
+    for index, frame in enumerate(frames):
+        frame.to_csv(path, mode='a', header=index == 0, index=False)
+
+
 def thoughput_data_generation(
     N_CUSTOMERS = 10,
-    P_CUSTOMERS = [13860/55991, 9240/55991, 6930/55991, 5544/55991,
-        4620/55991, 3960/55991, 3465/55991, 3080/55991, 2772/55991, 2520/55991],
+    P_CUSTOMERS = None,
     TOTAL_MONTHLY_MIN = 1000,
     TOTAL_MONTHLY_MAX = 1200,
     N_YEARS = 3,
     START_DATE = "2022-01-01",
     OUTPUT_FILE = "lumpy_customer_sales.csv",
-    test = False
+    test = False,
+    seed = None,
+    ORDERS_FILE = None,
+    chunk_rows = 1_000_000
     ):
+    """
+    Generates lumpy daily demand: one row per day with the total quantity ordered
+    and the last customer (by number) who ordered that day.
+
+    The per-order detail from `generate_orders` is aggregated chunk by chunk.
+    With test=True the daily series is written to OUTPUT_FILE. If ORDERS_FILE
+    (.csv or .parquet) is given, every individual order is also streamed there.
+    """
+    start = pd.Timestamp(START_DATE)
+    end_date = start + pd.DateOffset(years=N_YEARS) - pd.DateOffset(days=1)
+    dates = pd.date_range(start=start, end=end_date, freq='D')
+    orders = np.zeros(len(dates), dtype=np.int64)
+    last_customer = np.zeros(len(dates), dtype=np.int64)
+
+    def aggregate(frames):
+        for frame in frames:
+            day = (frame['Date'].values.astype('datetime64[D]') - start.to_datetime64().astype('datetime64[D]')).astype(np.int64)
+            orders[:] += np.bincount(day, weights=frame['orders'].values, minlength=len(dates)).astype(np.int64)
+            np.maximum.at(last_customer, day, frame['customer_id'].values)
+            yield frame
 
-    end_date = pd.to_datetime(START_DATE) + pd.DateOffset(years=N_YEARS) - pd.DateOffset(days=1)
-    dates = pd.date_range(start=START_DATE, end=end_date, freq='D')
-    daily_sales = pd.DataFrame(index=dates, columns=["orders", "customer"], data = [(0, "")]) #type: ignore
-
-
-    for month_start in pd.date_range(start=START_DATE,
-        end=end_date,
-        freq='MS'):
-        monthly_total_quantity = random.randint(TOTAL_MONTHLY_MIN, TOTAL_MONTHLY_MAX)
-        customer_quantities = np.random.multinomial(monthly_total_quantity,P_CUSTOMERS)
-        customer_quantities = np.array([int(i/10) * 10 for i in customer_quantities.tolist()])
-        base_days = np.linspace(4, 28, N_CUSTOMERS).astype(int)
-
-        for i in range(N_CUSTOMERS):
-            customer_id = "customer_" + str(i + 1)
-            order_day = base_days[i]
-            last_day_of_month = month_start.days_in_month
-            order_day = max(1, min(order_day, last_day_of_month))
-            order_date = pd.Timestamp(year=month_start.year, month=month_start.month, day=order_day)
-            order_quantity = customer_quantities[i]
-            if order_date in daily_sales.index:
-                daily_sales.loc[order_date, 'orders'] += order_quantity
-                daily_sales.loc[order_date, 'customer'] = customer_id
-    daily_sales.reset_index(inplace=True)
-    daily_sales.rename(columns={'index': 'Date'}, inplace=True)
+    frames = aggregate(generate_orders(N_CUSTOMERS, P_CUSTOMERS, TOTAL_MONTHLY_MIN, TOTAL_MONTHLY_MAX,
+                                       N_YEARS, START_DATE, seed, chunk_rows))
+    if ORDERS_FILE:
+        write_chunks(frames, ORDERS_FILE)
+    else:
+        for _ in frames:
+            pass
+
+    customer = np.where(last_customer > 0, np.char.add('customer_', last_customer.astype(str)), '')
+    daily_sales = pd.DataFrame({'Date': dates, 'orders': orders, 'customer': customer})
     if test:
         daily_sales.to_csv(OUTPUT_FILE, index=False)
     return daily_sales
 
-thoughput_data_generation(test = True)
+
+if __name__ == "__main__":
+    thoughput_data_generation(test = True)
@@ -0,0 +1,177 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+import numpy as np
+from reorder_point.reorder_point import customer_shares
+
+
+def demand_paths(
+    n_paths = 1000,
+    N_CUSTOMERS = 10,
+    P_CUSTOMERS = None,
+    TOTAL_MONTHLY_MIN = 1000,
+    TOTAL_MONTHLY_MAX = 1200,
+    N_YEARS = 1,
+    START_DATE = "2022-01-01",
+    seed = None
+    ) -> np.ndarray:
+    """
+    Draws `n_paths` independent daily demand series from the `thoughput_data_generation` model.
+
+    Each path has its own monthly totals and multinomial customer split.
+    Customer i orders on the same day of every month, and quantities are
+    rounded down to tens.
+
+    Returns:
+        np.ndarray: Demand of shape (n_paths, days).
+    """
+    rng = np.random.default_rng(seed)
+    shares = customer_shares(N_CUSTOMERS) if P_CUSTOMERS is None else np.asarray(P_CUSTOMERS, dtype=float)
+    start = pd.Timestamp(START_DATE)
+    end_date = start + pd.DateOffset(years=N_YEARS) - pd.DateOffset(days=1)
+    months = pd.date_range(start=start, end=end_date, freq='MS')
+    n_days = (end_date - start).days + 1
+
+    totals = rng.integers(TOTAL_MONTHLY_MIN, TOTAL_MONTHLY_MAX + 1, size=(n_paths, len(months)))
+    quantities = rng.multinomial(totals, shares) // 10 * 10                      # (paths, months, customers)
+    base_days = np.linspace(4, 28, N_CUSTOMERS).astype(int)
+    order_days = np.minimum(base_days[None, :], months.days_in_month.values[:, None])
+    day_index = ((months - start).days.values[:, None] + order_days - 1).ravel()  # (months * customers,)
+
+    flat = (np.arange(n_paths)[:, None] * n_days + day_index[None, :]).ravel()
+    demand = np.bincount(flat, weights=quantities.reshape(n_paths, -1).ravel(), minlength=n_paths * n_days)
+    return demand.reshape(n_paths, n_days)
+
+
+def _lead_time_sampler(lead_time, rng):
+    """Normalizes a lead time (days, or a (values, probabilities) pair) into (max_days, sampler(shape)). At least one day."""
+    if np.isscalar(lead_time):
+        days = max(1, int(lead_time))
+        return days, lambda shape: np.full(shape, days)
+    values, probabilities = (np.asarray(part) for part in lead_time)
+    values = np.maximum(1, values.astype(int))
+    return int(values.max()), lambda shape: rng.choice(values, size=shape, p=probabilities)
+
+
+def simulate(demand: np.ndarray, reorder_points, order_quantities, lead_time = 7, initial = None,
+             warmup = 0, backorders = False, seed = None) -> dict:
+    """
+    Runs every (s, Q) policy against every demand path at once.
+
+    Time is the only Python loop. Each day is a handful of NumPy operations
+    over a (policies, paths) array. Under continuous review, when the
+    inventory position (on hand + on order) falls to s or below, enough
+    multiples of Q are ordered to lift it above s. Orders arrive after a lead
+    time drawn per order. `lead_time` is a number of days or a
+    (values, probabilities) pair. Unmet demand is lost unless `backorders` is set.
+    Lead times are drawn per (path, day), so every policy sees the same demand
+    and the same lead times. Differences between policies are therefore not
+    sampling noise.
+
+    Returns:
+        dict: Per-(policy, path) arrays of shape (policies, paths): 'fill_rate', 'stockout_days',
+        'avg_inventory' and 'orders', measured after the first `warmup` days.
+    """
+    rng = np.random.default_rng(seed)
+    s = np.asarray(reorder_points, dtype=float).reshape(-1, 1)
+    q = np.asarray(order_quantities, dtype=float).reshape(-1, 1)
+    s, q = np.broadcast_arrays(s, q)
+    n_paths, n_days = demand.shape
+    shape = (len(s), n_paths)
+
+    max_lead, sample_lead = _lead_time_sampler(lead_time, rng)
+    lead_times = sample_lead((n_paths, n_days))
+    ring = max_lead + 1
+    arrivals = np.zeros((ring,) + shape)
+    on_hand = np.broadcast_to(s + q if initial is None else np.asarray(initial, dtype=float), shape).copy()
+    on_order = np.zeros(shape)
+    demanded = np.zeros(shape)
+    served = np.zeros(shape)
+    stockout_days = np.zeros(shape)
+    inventory = np.zeros(shape)
+    orders = np.zeros(shape)
+
+    for day in range(n_days):
+        slot = day % ring
+        on_hand += arrivals[slot]
+        on_order -= arrivals[slot]
+        arrivals[slot] = 0
+
+        today = demand[:, day]
+        filled = np.minimum(np.maximum(on_hand, 0), today)
+        on_hand -= today if backorders else filled
+        if day >= warmup:
+            demanded += today
+            served += filled
+            stockout_days += filled < today
+            inventory += np.maximum(on_hand, 0)
+
+        position = on_hand + on_order
+        reorder = position <= s
+        if reorder.any():
+            lanes = np.nonzero(reorder)
+            batches = np.floor((s[lanes[0], 0] - position[lanes]) / q[lanes[0], 0]) + 1
+            quantity = batches * q[lanes[0], 0]
+            due = (day + lead_times[lanes[1], day]) % ring
+            arrivals[due, lanes[0], lanes[1]] += quantity
+            on_order[lanes] += quantity
+            if day >= warmup:
+                orders[lanes] += 1
+
+    measured = max(1, n_days - warmup)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fill_rate = np.where(demanded > 0, served / demanded, 1.0)
+    return {
+        'fill_rate': fill_rate,
+        'stockout_days': stockout_days,
+        'avg_inventory': inventory / measured,
+        'orders': orders,
+    }
+
+
+def _evaluate(args) -> pd.DataFrame:
+    demand, policies, options = args
+    results = simulate(demand, policies[:, 0], policies[:, 1], **options)
+    return pd.DataFrame({
+        'reorder_point': policies[:, 0],
+        'order_quantity': policies[:, 1],
+        'fill_rate': results['fill_rate'].mean(axis=1),
+        'fill_rate_p5': np.percentile(results['fill_rate'], 5, axis=1),
+        'stockout_days': results['stockout_days'].mean(axis=1),
+        'avg_inventory': results['avg_inventory'].mean(axis=1),
+        'orders': results['orders'].mean(axis=1),
+    })
+
+
+def evaluate_policies(reorder_points, order_quantities, n_paths = 1000, lead_time = 7, processes = None,
+                      seed = None, warmup = 0, backorders = False, **demand_options) -> pd.DataFrame:
+    """
+    Evaluates every combination of reorder point and order quantity over the same `n_paths` demand paths.
+
+    The grid is split across `processes` worker processes (default: one per
+    CPU, capped by the number of policies; 1 runs in-process). Each worker
+    gets the same demand paths and, given a seed, the same lead times, so the
+    results do not depend on how the grid is split. `demand_options` go to `demand_paths`
+    (N_CUSTOMERS, N_YEARS, ...).
+
+    Returns:
+        pd.DataFrame: One row per policy with mean fill rate, 5th-percentile fill rate,
+        mean stockout days, mean average inventory and mean number of orders.
+    """
+    demand = demand_paths(n_paths, seed=seed, **demand_options)
+    grid = np.array([(s, q) for s in np.atleast_1d(reorder_points) for q in np.atleast_1d(order_quantities)], dtype=float)
+    options = {'lead_time': lead_time, 'seed': None if seed is None else seed + 1, 'warmup': warmup, 'backorders': backorders}
+    processes = min(processes or os.cpu_count() or 1, len(grid))
+    if processes <= 1:
+        return _evaluate((demand, grid, options))
+    jobs = [(demand, part, options) for part in np.array_split(grid, processes)]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return pd.concat(pool.map(_evaluate, jobs), ignore_index=True)
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    table = evaluate_policies(np.arange(100, 1001, 50), np.arange(200, 1201, 100), n_paths=1000, lead_time=([5, 7, 10], [0.3, 0.5, 0.2]), seed=0)
+    print(table.sort_values(['fill_rate', 'avg_inventory'], ascending=[False, True]).head(15).to_string(index=False))
+    print(f"{len(table)} policies x 1000 paths in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,208 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Optional
+import logging
+from websites.normalize import query_title
+
+# Upper bound on concurrent browser sessions per platform. Keeps a single site
+# from seeing a burst of parallel sessions from the same machine.
+DEFAULT_PLATFORM_LIMITS = {
+    'Amazon': 2,
+    'Flipkart': 1,
+    'Croma': 2,
+    'Reliance': 2,
+}
+
+
+class ScrapeTask:
+    """
+    A single independent unit of crawl work: one product, in one city, on one platform.
+
+    `fan_out` lists further (city, pincode) pairs that the same rows are stored
+    under, for platforms whose results don't depend on the location.
+    """
+    def __init__(self, platform: str, product: str, city: str, pincode: str, fan_out: tuple = ()):
+        self.platform = platform
+        self.product = product
+        self.city = city
+        self.pincode = pincode
+        self.fan_out = tuple(fan_out)
+
+    @property
+    def cities(self) -> list:
+        """Every city this task's rows are stored under."""
+        return [self.city] + [city for city, _ in self.fan_out]
+
+    @property
+    def key(self) -> tuple:
+        return (self.platform, self.product, self.city)
+
+    def __repr__(self):
+        return f"ScrapeTask({self.platform!r}, {self.product!r}, {self.city!r}, {self.pincode!r})"
+
+
+def build_tasks(products: list, pincodes: dict, platforms: list, policy=None) -> list:
+    """
+    Expands the schema into independent (product x city x platform) tasks.
+
+    Platforms the LocationPolicy deems location-insensitive are scheduled once
+    per product, in the first city, with every other city as fan-out. The
+    policy's probe city, if any, is scraped separately instead of fanned out.
+    """
+    cities = list(pincodes)
+    tasks = []
+    for product in products:
+        for index, city in enumerate(cities):
+            for platform in platforms:
+                if policy is not None and policy.is_insensitive(platform):
+                    probe = policy.probe_city(platform, cities)
+                    if index == 0:
+                        fan_out = [(other, str(pincodes[other])) for other in cities[1:] if other != probe]
+                        tasks.append(ScrapeTask(platform, product, city, str(pincodes[city]), fan_out))
+                    elif city == probe:
+                        tasks.append(ScrapeTask(platform, product, city, str(pincodes[city])))
+                    continue
+                tasks.append(ScrapeTask(platform, product, city, str(pincodes[city])))
+    return tasks
+
+
+def drop_fresh(tasks: list, fresh: set) -> list:
+    """
+    Removes tasks whose (platform, stored title, city) is already in `fresh` for every city they cover.
+
+    `fresh` is the set returned by DataAggregator.fresh_keys.
+    """
+    return [
+        task for task in tasks
+        if any((task.platform, query_title(task.product), city) not in fresh for city in task.cities)
+    ]
+
+
+class TaskGroup:
+    """
+    Tasks that share a platform and pincode and are run back to back in one browser session.
+    """
+    def __init__(self, tasks: list):
+        self.tasks = tasks
+        self.platform = tasks[0].platform
+        self.city = tasks[0].city
+        self.pincode = tasks[0].pincode
+
+    def __repr__(self):
+        return f"TaskGroup({self.platform!r}, {self.city!r}, {len(self.tasks)} tasks)"
+
+
+def group_tasks(tasks: list, order: str = 'pincode') -> list:
+    """
+    Groups tasks for execution.
+
+    With order='pincode' every (platform, pincode) pair becomes one group, so
+    the location is set once per city per platform and every product is then
+    searched in that session. With order='product' each task is its own group,
+    which is the old product-major behaviour.
+    """
+    if order == 'product':
+        return [TaskGroup([task]) for task in tasks]
+    grouped: dict = {}
+    for task in tasks:
+        grouped.setdefault((task.platform, task.pincode), []).append(task)
+    return [TaskGroup(group) for group in grouped.values()]
+
+
+class CrawlScheduler:
+    """
+    Runs task groups on a bounded worker pool with per-platform concurrency limits.
+
+    Attributes:
+        runners (dict): Maps a platform name to a callable taking a TaskGroup and yielding (task, rows) pairs.
+        max_workers (int): Total number of groups allowed in flight at once.
+        platform_limits (dict): Maximum number of in-flight groups per platform.
+        logger (logging.Logger): Logger instance for logging messages.
+    """
+    def __init__(self, runners: dict, max_workers: int = 4, platform_limits: Optional[dict] = None, logger: Optional[logging.Logger] = None):
+        self.runners = runners
+        self.max_workers = max(1, max_workers)
+        self.platform_limits = dict(DEFAULT_PLATFORM_LIMITS)
+        if platform_limits:
+            self.platform_limits.update(platform_limits)
+        self.logger = logger
+
+    def _execute(self, group: TaskGroup, on_result: Callable, results: dict):
+        # Counts go into `results` as each task finishes, so a group that fails partway
+        # still reports the tasks it completed.
+        for task, data in self.runners[group.platform](group):
+            try:
+                on_result(task, data)
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f"Result handler failed for {task}: {e}")
+            results[task.key] = None if data is None else len(data)
+            if self.logger:
+                if data is None:
+                    self.logger.warning(f"{task.platform} scrape failed for {task.product} in {task.city or task.pincode}.")
+                else:
+                    self.logger.info(f"{task.platform} data processed successfully finished.")
+        for task in group.tasks:
+            results.setdefault(task.key, None)
+
+    def run(self, groups: list, on_result: Callable) -> dict:
+        """
+        Runs every group and passes each task's rows to `on_result(task, rows)` from the worker thread.
+        rows is None when the runner reports the task as failed.
+
+        Groups are only handed to the pool when their platform has a free slot, so
+        no worker ever sits blocked waiting on another platform's limit.
+
+        Returns:
+            dict: Maps each task key to the number of rows it produced, or None if it failed
+            or was never reached because its group failed earlier.
+        """
+        pending: dict = {}
+        for group in groups:
+            if group.platform not in self.runners:
+                if self.logger:
+                    self.logger.warning(f"No runner registered for platform {group.platform}, skipping {group}")
+                continue
+            pending.setdefault(group.platform, deque()).append(group)
+
+        in_flight_per_platform = {platform: 0 for platform in pending}
+        results: dict = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='crawl') as pool:
+            futures: dict = {}
+
+            def dispatch():
+                # Round-robin over platforms so one long queue cannot starve the others.
+                progressed = True
+                while progressed and len(futures) < self.max_workers:
+                    progressed = False
+                    for platform, queue in pending.items():
+                        if not queue or len(futures) >= self.max_workers:
+                            continue
+                        if in_flight_per_platform[platform] >= self.platform_limits.get(platform, 1):
+                            continue
+                        group = queue.popleft()
+                        in_flight_per_platform[platform] += 1
+                        futures[pool.submit(self._execute, group, on_result, results)] = group
+                        progressed = True
+
+            dispatch()
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    group = futures.pop(future)
+                    in_flight_per_platform[group.platform] -= 1
+                    try:
+                        future.result()
+                    except Exception as e:
+                        # Tasks the group finished before failing keep their counts.
+                        for task in group.tasks:
+                            results.setdefault(task.key, None)
+                        if self.logger:
+                            self.logger.error(f"{group} failed: {e}")
+                dispatch()
+
+        if self.logger:
+            failed = sum(1 for count in results.values() if count is None)
+            self.logger.info(f"Scheduler finished {len(results)} tasks ({failed} failed).")
+        return results
@@ -0,0 +1,115 @@
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Optional
+import logging
+
+
+class TaskJournal:
+    """
+    A durable record of which crawl tasks finished, in a local SQLite file.
+
+    Every task outcome is committed as soon as it is known, so a crash or OOM
+    loses at most the tasks that were in flight. A scraped task stays
+    'pending' until its rows are durably stored (see `mark_done`), so a crash
+    while they are still buffered in memory gets it scraped again on resume. A resumed run reuses the
+    latest run id, skips tasks already marked done and retries failed ones
+    until they have been attempted `max_attempts` times.
+
+    Attributes:
+        path (str): SQLite file holding the journal.
+        run_id (str): Identifier shared by every task of one crawl.
+        logger (logging.Logger): Logger instance for logging messages.
+    """
+    def __init__(self, path: str, resume: bool = False, logger: Optional[logging.Logger] = None):
+        self.path = path
+        self.logger = logger
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                run_id TEXT NOT NULL,
+                platform TEXT NOT NULL,
+                product TEXT NOT NULL,
+                city TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 1,
+                rows INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (run_id, platform, product, city)
+            )
+        """)
+        self._conn.commit()
+        latest = self._conn.execute("SELECT MAX(run_id) FROM tasks").fetchone()[0]
+        if resume and latest:
+            self.run_id = latest
+        else:
+            if resume and self.logger:
+                self.logger.warning(f"Nothing to resume in {path}; starting a new run.")
+            self.run_id = datetime.now().strftime('%Y%m%dT%H%M%S')
+        if self.logger:
+            self.logger.info(f"Task journal {path}, run {self.run_id}.")
+
+    def record(self, task, ok: bool, rows: int = 0, error: Optional[str] = None, durable: bool = True):
+        """
+        Commits the outcome of one task. Safe to call from any worker thread.
+
+        A successful task whose rows are not yet stored is recorded with
+        durable=False and stays 'pending' until `mark_done` is called for it.
+        """
+        status = ('done' if durable else 'pending') if ok else 'failed'
+        with self._lock:
+            self._conn.execute("""
+                INSERT INTO tasks (run_id, platform, product, city, status, rows, error, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (run_id, platform, product, city) DO UPDATE SET
+                    status = excluded.status,
+                    attempts = attempts + 1,
+                    rows = excluded.rows,
+                    error = excluded.error,
+                    updated_at = excluded.updated_at
+            """, (self.run_id, task.platform, task.product, task.city, status,
+                  rows, error, datetime.now().isoformat(timespec='seconds')))
+            self._conn.commit()
+
+    def mark_done(self, task):
+        """Marks a pending task done once its rows are in the database or the spool. Does not count as an attempt."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE tasks SET status = 'done', updated_at = ? "
+                "WHERE run_id = ? AND platform = ? AND product = ? AND city = ? AND status = 'pending'",
+                (datetime.now().isoformat(timespec='seconds'), self.run_id, task.platform, task.product, task.city)
+            )
+            self._conn.commit()
+
+    def outcomes(self) -> dict:
+        """Maps each journaled task key of this run to (status, attempts)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT platform, product, city, status, attempts FROM tasks WHERE run_id = ?", (self.run_id,)
+            ).fetchall()
+        return {(platform, product, city): (status, attempts) for platform, product, city, status, attempts in rows}
+
+    def pending(self, tasks: list, max_attempts: int = 3) -> list:
+        """Drops tasks that are done, or that have already been attempted `max_attempts` times without being stored."""
+        outcomes = self.outcomes()
+        remaining = []
+        done = exhausted = 0
+        for task in tasks:
+            status, attempts = outcomes.get(task.key, (None, 0))
+            if status == 'done':
+                done += 1
+            elif attempts >= max_attempts:
+                exhausted += 1
+            else:
+                remaining.append(task)
+        if self.logger:
+            self.logger.info(f"Resuming run {self.run_id}: {done} tasks done, {exhausted} gave up after "
+                             f"{max_attempts} attempts, {len(remaining)} to run.")
+        return remaining
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
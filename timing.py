@@ -0,0 +1,105 @@
+import json
+import math
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional
+import logging
+
+
+def percentile(values: list, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return 0.0
+    return values[min(len(values), max(1, math.ceil(fraction * len(values)))) - 1]
+
+
+class Span:
+    """Handle yielded by `SpanRecorder.span`; set `ok = False` when a step reports failure without raising."""
+    def __init__(self):
+        self.ok = True
+
+
+class SpanRecorder:
+    """
+    Records how long each stage of a run takes.
+
+    Every span is written as one JSON line to `path`, tagged with whatever the
+    caller knows (platform, pincode, product, ...), and kept in memory for the
+    end-of-run summary of p50/p95/max per stage and platform. Failed spans are
+    recorded too, with "ok": false: a block that raises, or one that sets
+    `ok = False` on the yielded Span because its step returned a failure.
+
+    Attributes:
+        path (str): JSON-lines file spans are appended to; None keeps them in memory only.
+        logger (logging.Logger): Logger instance for logging messages.
+    """
+    def __init__(self, path: Optional[str] = None, logger: Optional[logging.Logger] = None):
+        self.path = path
+        self.logger = logger
+        self._lock = threading.Lock()
+        self._durations: dict = defaultdict(list)
+        self._file = open(path, 'a', encoding='utf-8') if path else None
+
+    def record(self, stage: str, seconds: float, ok: bool = True, **tags):
+        with self._lock:
+            self._durations[(stage, tags.get('platform', '-'))].append(seconds)
+            if self._file:
+                self._file.write(json.dumps({
+                    'ts': datetime.now().isoformat(timespec='milliseconds'),
+                    'stage': stage, 'seconds': round(seconds, 4), 'ok': ok, **tags,
+                }, default=str) + '\n')
+                self._file.flush()
+
+    @contextmanager
+    def span(self, stage: str, **tags):
+        """Times the block as `stage`; the span is recorded even if the block raises."""
+        start = time.perf_counter()
+        handle = Span()
+        ok = False
+        try:
+            yield handle
+            ok = handle.ok
+        finally:
+            self.record(stage, time.perf_counter() - start, ok, **tags)
+
+    def summary(self) -> list:
+        """Rows of (stage, platform, count, total, p50, p95, max), sorted by total time spent."""
+        with self._lock:
+            items = [(key, sorted(values)) for key, values in self._durations.items()]
+        rows = [
+            (stage, platform, len(values), sum(values), percentile(values, 0.5), percentile(values, 0.95), values[-1])
+            for (stage, platform), values in items
+        ]
+        return sorted(rows, key=lambda row: row[3], reverse=True)
+
+    def format_summary(self) -> str:
+        lines = [f"{'stage':<24} {'platform':<10} {'count':>6} {'total s':>9} {'p50 s':>8} {'p95 s':>8} {'max s':>8}"]
+        for stage, platform, count, total, p50, p95, longest in self.summary():
+            lines.append(f"{stage:<24} {platform:<10} {count:>6} {total:>9.2f} {p50:>8.2f} {p95:>8.2f} {longest:>8.2f}")
+        return "\n".join(lines)
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+
+# Process-wide recorder, like the logging module's root logger: code times its stages with
+# `timing.span(...)` and the entry point decides where spans go with `configure`.
+RECORDER = SpanRecorder()
+
+
+def configure(path: Optional[str] = None, logger: Optional[logging.Logger] = None) -> SpanRecorder:
+    """Replaces the process-wide recorder, e.g. to start writing spans to a file."""
+    global RECORDER
+    RECORDER = SpanRecorder(path, logger)
+    return RECORDER
+
+
+def span(stage: str, **tags):
+    """Times a block on the process-wide recorder: `with timing.span('search_product', platform='Amazon'):`."""
+    return RECORDER.span(stage, **tags)
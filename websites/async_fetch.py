@@ -0,0 +1,131 @@
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Optional
+from urllib.parse import urlparse
+import logging
+import httpx
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Asyncio token bucket: at most `rate` acquisitions per second, with bursts up to `capacity`.
+    """
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncFetcher:
+    """
+    Shared HTTP client for API-backed platforms.
+
+    Every request goes through a per-host token bucket and a global cap on
+    in-flight requests, and is retried with exponential backoff plus full
+    jitter on transport errors and retryable status codes.
+
+    Attributes:
+        rate_per_host (float): Requests per second allowed to any one host.
+        burst (float): Token bucket capacity per host.
+        max_in_flight (int): Requests allowed on the wire at once across all hosts.
+        retries (int): Retries after the first attempt.
+        backoff (float): Base backoff in seconds; attempt n waits up to backoff * 2**n.
+        logger (logging.Logger): Logger instance for logging messages.
+    """
+    def __init__(self, rate_per_host: float = 10.0, burst: Optional[float] = None, max_in_flight: int = 32,
+                 retries: int = 3, backoff: float = 0.5, timeout: float = 15.0, headers: Optional[dict] = None,
+                 logger: Optional[logging.Logger] = None):
+        self.rate_per_host = rate_per_host
+        self.burst = burst
+        self.retries = retries
+        self.backoff = backoff
+        self.logger = logger
+        self._buckets: dict = {}
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            headers=headers,
+            limits=httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+        )
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = urlparse(url).netloc
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate_per_host, self.burst)
+        return self._buckets[host]
+
+    async def get_json(self, url: str, params: Optional[dict] = None, headers: Optional[dict] = None):
+        bucket = self._bucket(url)
+        for attempt in range(self.retries + 1):
+            await bucket.acquire()
+            try:
+                async with self._in_flight:
+                    response = await self.client.get(url, params=params, headers=headers)
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    return response.json()
+                error: Exception = httpx.HTTPStatusError(f"Retryable status {response.status_code}", request=response.request, response=response)
+            except httpx.TransportError as e:
+                error = e
+            if attempt == self.retries:
+                raise error
+            delay = random.uniform(0, self.backoff * (2 ** attempt))
+            if self.logger:
+                self.logger.debug(f"Retrying {url} in {delay:.2f}s after: {error}")
+            await asyncio.sleep(delay)
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+
+async def fan_out(items: list, fetch: Callable[[object], Awaitable], on_result: Callable,
+                  logger: Optional[logging.Logger] = None) -> dict:
+    """
+    Fires `fetch(item)` for every item at once and streams results as they complete.
+
+    `on_result(item, result)` is a plain blocking callable such as the DB writer;
+    it runs in a worker thread so a slow write never stalls the event loop.
+    A failed fetch is logged and reported to `on_result` as None, as a failed browser scrape is.
+
+    Returns:
+        dict: Counts of 'ok' and 'failed' items.
+    """
+    async def run_one(item):
+        try:
+            return item, await fetch(item), None
+        except Exception as e:
+            return item, None, e
+
+    counts = {'ok': 0, 'failed': 0}
+    for next_done in asyncio.as_completed([run_one(item) for item in items]):
+        item, result, error = await next_done
+        if error is not None:
+            counts['failed'] += 1
+            if logger:
+                logger.error(f"Fetch failed for {item}: {error}")
+        else:
+            counts['ok'] += 1
+        await asyncio.to_thread(on_result, item, result)
+    return counts
@@ -1,46 +1,63 @@
-from time import sleep
-from random import uniform
+from typing import Optional
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
-from bs4 import BeautifulSoup
-import re
 import sys
-from collections import defaultdict
 from selenium.webdriver.support import expected_conditions as EC
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
+from websites.waits import Waiter
+from websites.session import use_private_profile, remove_profile
+from websites.extract import extract_in_browser
+from websites.parsing import parse_cards
+from websites.normalize import min_price_by_product
+
+WAIT_JITTER = (0.3, 0.8)
+SELECTORS = {
+    'container': 'div[class="cp-product typ-plp plp-srp-typ"]',
+    'strainer': {'name': 'div', 'attrs': {'class': 'cp-product typ-plp plp-srp-typ'}},
+    'fields': {
+        'name': {'css': 'h3[class="product-title plp-prod-title 999"]'},
+        'price': {'css': 'div[class="new-price plp-srp-new-price-cont"]'},
+        'rating': {'css': 'span.rating-text'},
+    },
+}
+RESULTS_SELECTOR = SELECTORS['container']
+ZIP_INPUT_XPATH = '/html/body/div[5]/div[3]/div/div/div/div/div[1]/input'
 
 class CromaScraper:
     def __init__(self, logger, website: str):
         self.logger = logger
         self.driver: webdriver.Chrome | webdriver.Firefox
+        self.user_data_dir: Optional[str] = None
         self.website = website
+        self.waits = Waiter(self, jitter=WAIT_JITTER, logger=logger)
 
     def change_location(self, zip_code: str) -> bool:
         try:
             self.driver.get(self.website)
-            sleep(uniform(2, 4))
+            self.waits.until_ready()
             location_button = WebDriverWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.XPATH, '//*[@id="container"]/div/div[1]/div[1]/div/div[6]/div[2]/div[1]/div'))
             )
             location_button.click()
-            sleep(uniform(2, 4))
+            self.waits.pause()
             zip_input = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, '/html/body/div[5]/div[3]/div/div/div/div/div[1]/input'))
+                EC.presence_of_element_located((By.XPATH, ZIP_INPUT_XPATH))
             )
 
             for _ in range(6):
                 zip_input.send_keys(Keys.BACKSPACE)
-                sleep(uniform(0.1, 0.3))
+                self.waits.pause(0.05, 0.15)
 
             zip_input.send_keys(str(zip_code))
-            sleep(uniform(2, 4))
+            self.waits.pause()
             update_button = WebDriverWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.XPATH, '//*[@id="apply-pincode-btn"]'))
             )
             update_button.click()
-            sleep(uniform(2, 4))
+            self.waits.until_gone((By.XPATH, ZIP_INPUT_XPATH))
+            self.waits.until_ready()
             if self.logger:
                 self.logger.info(f"Successfully changed location to {zip_code}")
             return True
@@ -55,11 +72,10 @@ class CromaScraper:
                 EC.element_to_be_clickable((By.XPATH, '//*[@id="searchV2"]'))
             )
             search_bar.click()
-            sleep(uniform(1, 3))
+            self.waits.pause()
             search_bar.send_keys(product)
-            sleep(uniform(1, 3))
+            self.waits.pause()
             search_bar.send_keys(Keys.RETURN)
-            sleep(uniform(2, 4))
             if self.logger:
                 self.logger.info(f"Successfully searched for {product}")
             return True
@@ -68,71 +84,38 @@ class CromaScraper:
                 self.logger.error(f"Error searching for {product}: {e}")
             return False
 
+    @staticmethod
+    def product_from_fields(fields: dict) -> Optional[dict]:
+        """Builds a product row from raw card values, or None if the card has no name."""
+        if not fields.get('name'):
+            return None
+        price = fields.get('price')
+        return {
+            "name": fields['name'],
+            "price": price.split(" ")[0].replace("₹", "").replace(",", "") if price else "N/A",
+            "rating": fields.get('rating') or "N/A"
+        }
+
     def scrape_product_details(self) -> list:
-        soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-        product_details = []
-
-        results = soup.find_all("div", class_="cp-product typ-plp plp-srp-typ")
-        for result in results:
-            # No need to skip Sponsored Stuff
-            product_name = result.find("h3", class_ = "product-title plp-prod-title 999") # type: ignore
-            product_price = result.find("div", class_= "new-price plp-srp-new-price-cont") # type: ignore
-            product_rating = result.find("span", class_ = "rating-text") # type: ignore
-
-            product_name = product_name.text.strip() if product_name else "N/A"
-            product_price = product_price.text.strip().split(" ")[0].replace("₹", "").replace(",", "") if product_price else "N/A"
-            product_rating = product_rating.text.strip() if product_rating else "N/A"
-
-            if product_name == "N/A":
-                continue
-
-            product_details.append({
-                "name": product_name,
-                "price": product_price,
-                "rating": product_rating
-            })
+        self.waits.until_count_stable(RESULTS_SELECTOR)
+        rows = extract_in_browser(self.driver, SELECTORS, self.logger)
+        if rows is None:
+            rows = parse_cards(self.driver.page_source, SELECTORS)
+        product_details = [product for product in map(self.product_from_fields, rows) if product]
         if self.logger:
             self.logger.info(f"Scraped {len(product_details)} product details")
         return product_details
 
     @staticmethod
     def clean_product_data(products, logger=None):
-        if logger:
-            logger.info(f"Cleaning {len(products)} products.")
-        processed_products = defaultdict(lambda: {'price': float('inf')})
-
-        for item in products:
-            name = item.get('name', '')
-            price_str = item.get('price', '0')
-
-            match = re.match(r'(.*?)\s\((\d+GB),\s([^)]+)\)', name)
-            if not match:
-                continue
-
-            model, storage, _ = match.groups()
-            model = model.replace('Apple', '').strip()
-            storage = storage.strip().replace('GB', ' GB')
-
-            product_key = (model, storage)
-
-            try:
-                price = int(price_str)
-            except (ValueError, TypeError):
-                price = 0
-
-            if price < processed_products[product_key]['price']:
-                processed_products[product_key]['price'] = price
-                processed_products[product_key]['title'] = f"{model} {storage}" # type: ignore
-
-        cleaned_products = [data for data in processed_products.values() if 'title' in data]
-        if logger:
-            logger.info(f"Returned {len(cleaned_products)} products after cleaning.")
-        return cleaned_products
+        return min_price_by_product(products, 'Croma', 'name', logger)
 
     def quit(self):
         if self.logger:
             self.logger.info("Quitting driver.")
         self.driver.quit()
+        remove_profile(self.user_data_dir)
+        self.user_data_dir = None
 
 class CromaLocalScraper(CromaScraper):
     def __init__(self, logger, website: str):
@@ -164,18 +147,25 @@ class CromaServerScraper(CromaScraper):
         options.add_experimental_option(
             "prefs", {"profile.default_content_setting_values.geolocation": 2}
         )
-        options.add_argument("--user-data-dir=/tmp/chrome-user-data")
+        self.user_data_dir = use_private_profile(options)
         options.add_argument("--headless") # Runs Chrome in headless mode.
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-dev-shm-usage")
         self.driver = webdriver.Chrome(options=options, service = service)
 
-def run(target_machine: str, pincode: str | int, product_name: str, logger, website: str = "https://www.croma.com/"):
-    cromaSc: CromaServerScraper | CromaLocalScraper
+
+LOCATION_AWARE = True
+
+def get_scraper(target_machine, logger, website: str = "https://www.croma.com/"):
     if target_machine == 'local':
-        cromaSc = CromaLocalScraper(logger, website)
-    else:
-        cromaSc = CromaServerScraper(logger, website)
+        return CromaLocalScraper(logger, website)
+    return CromaServerScraper(logger, website)
+
+def clean(products: list, product_name: str, logger=None) -> list:
+    return CromaScraper.clean_product_data(products, logger)
+
+def run(target_machine: str, pincode: str | int, product_name: str, logger, website: str = "https://www.croma.com/"):
+    cromaSc = get_scraper(target_machine, logger, website)
     cromaSc.get_driver()
 
     location_success = cromaSc.change_location(str(pincode))
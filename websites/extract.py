@@ -0,0 +1,65 @@
+"""
+In-browser extraction of search-result cards.
+
+Every scraper module declares its result cards once, as a module-level
+SELECTORS spec. The same spec drives both extraction paths:
+`extract_in_browser` runs it inside the page, and `websites.parsing.parse_cards`
+runs it over page_source when browser extraction is off or fails. A spec looks like:
+
+    {
+        'container': CSS selector for one result card,
+        'skip': {'css': ..., 'text': ...},   # optional; drop cards where a match contains text
+        'strainer': {'name': tag, 'attrs': {...}},   # optional; parse_cards only parses matching tags
+        'fields': {name: {'css': ..., 'count': bool}},
+    }
+
+Text fields come back stripped, or None when missing; count fields come back as ints.
+"""
+import os
+from typing import Optional
+import logging
+
+# EXTRACTION_MODE=html skips the in-browser path and always parses page_source.
+BROWSER_EXTRACTION = os.getenv('EXTRACTION_MODE', 'browser').lower() != 'html'
+
+# One static script for every platform; the selector spec is passed in as arguments[0].
+# textContent (not innerText) is used so values match BeautifulSoup's `.text`.
+EXTRACT_JS = """
+const spec = arguments[0];
+const rows = [];
+for (const card of document.querySelectorAll(spec.container)) {
+    if (spec.skip && Array.from(card.querySelectorAll(spec.skip.css)).some(e => e.textContent.includes(spec.skip.text))) {
+        continue;
+    }
+    const row = {};
+    for (const [name, field] of Object.entries(spec.fields)) {
+        if (field.count) {
+            row[name] = card.querySelectorAll(field.css).length;
+        } else {
+            const element = card.querySelector(field.css);
+            row[name] = element ? element.textContent.trim() : null;
+        }
+    }
+    rows.push(row);
+}
+return rows;
+"""
+
+
+def extract_in_browser(driver, spec: dict, logger: Optional[logging.Logger] = None) -> Optional[list]:
+    """
+    Runs the selector spec (see the module docstring) inside the page and returns
+    one dict of raw field values per result card.
+
+    Returns None if extraction is disabled or the script fails, so callers can
+    fall back to parsing `page_source`.
+    """
+    if not BROWSER_EXTRACTION:
+        return None
+    try:
+        rows = driver.execute_script(EXTRACT_JS, spec)
+    except Exception as e:
+        if logger:
+            logger.warning(f"In-browser extraction failed, falling back to HTML parsing: {e}")
+        return None
+    return rows if isinstance(rows, list) else None
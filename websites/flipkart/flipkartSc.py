@@ -1,38 +1,51 @@
-from time import sleep
-from random import uniform
 import logging
 from typing import Optional
-from collections import defaultdict
 from selenium.webdriver.common.by import By
 import sys
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
-from bs4 import BeautifulSoup
-import re
 from selenium.webdriver.support import expected_conditions as EC
 from selenium import webdriver
 
 from selenium.webdriver.chrome.service import Service
+from websites.waits import Waiter
+from websites.session import use_private_profile, remove_profile
+from websites.extract import extract_in_browser
+from websites.parsing import parse_cards
+from websites.normalize import min_price_by_product
+
+WAIT_JITTER = (0.3, 0.8)
+SELECTORS = {
+    'container': 'div._75nlfW',
+    'strainer': {'name': 'div', 'attrs': {'class': '_75nlfW'}},
+    'fields': {
+        'title': {'css': 'div.KzDlHZ'},
+        'rating': {'css': 'div.XQDdHH'},
+        'price': {'css': 'div[class="Nx9bqj _4b5DiR"]'},
+    },
+}
+RESULTS_SELECTOR = SELECTORS['container']
 
 class FlipkartScraper:
     def __init__(self, website: str, logger: Optional[logging.Logger] = None):
         self.website = website
         self.driver: webdriver.Chrome | webdriver.Firefox
+        self.user_data_dir: Optional[str] = None
         self.logger = logger
+        self.waits = Waiter(self, jitter=WAIT_JITTER, logger=logger)
 
     def search_product(self, product_name: str) -> bool:
         try:
             self.driver.get(self.website)
-            sleep(uniform(2, 4))
+            self.waits.until_ready()
             search_bar = WebDriverWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.XPATH, '//*[@id="container"]/div/div[1]/div/div/div/div/div/div/div/div/div/div[1]/div/div/header/div[1]/div[2]/form/div/div/input'))
             )
             search_bar.click()
-            sleep(uniform(1, 3))
+            self.waits.pause()
             search_bar.send_keys(product_name)
-            sleep(0.5)
+            self.waits.pause()
             search_bar.send_keys(Keys.RETURN)
-            sleep(uniform(2, 4))
             if self.logger:
                 self.logger.info(f"Successfully searched for {product_name}")
             return True
@@ -40,26 +53,21 @@ class FlipkartScraper:
             if self.logger:
                 self.logger.error(f"Error searching product: {e}")
             return False
+    @staticmethod
+    def product_from_fields(fields: dict) -> dict:
+        return {
+            'title': fields.get('title') or "N/A",
+            'rating': fields.get('rating') or "N/A",
+            'price': fields.get('price') or "N/A"
+        }
+
     def scrape_product_details(self) -> list:
         try:
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            results = soup.find_all('div', class_ = '_75nlfW')
-
-            products = []
-            for result in results:
-                title = result.find('div', class_ = 'KzDlHZ') #type: ignore
-                rating = result.find('div', class_ = 'XQDdHH') #type: ignore
-                price = result.find('div', class_ = 'Nx9bqj _4b5DiR') #type: ignore
-
-                title = title.text.strip() if title else "N/A"
-                rating = rating.text.strip() if rating else "N/A"
-                price = price.text.strip() if price else "N/A"
-
-                products.append({
-                    'title': title,
-                    'rating': rating,
-                    'price': price
-                })
+            self.waits.until_count_stable(RESULTS_SELECTOR)
+            rows = extract_in_browser(self.driver, SELECTORS, self.logger)
+            if rows is None:
+                rows = parse_cards(self.driver.page_source, SELECTORS)
+            products = [self.product_from_fields(row) for row in rows]
 
             if self.logger:
                 self.logger.info(f"Scraped {len(products)} product details.")
@@ -71,48 +79,14 @@ class FlipkartScraper:
 
     @staticmethod
     def clean_product_data(products: list, logger=None):
-        if logger:
-            logger.info(f"Cleaning {len(products)} products.")
-        processed_products = defaultdict(lambda: {'price': float('inf')})
-
-        for product in products:
-            title = product['title']
-            price_str = product['price']
-            match = re.match(r'(.*?)\s\(([^,]+),\s([^)]+)\)', title)
-            if not match:
-                if logger:
-                    logger.debug(f"Skipping product due to no regex match: {title}")
-                continue
-
-            model, _, storage = match.groups()
-            model = model.replace("Apple", "").strip()
-            storage = storage.strip()
-
-            try:
-                price = int(re.sub(r'[₹,]', '', price_str))
-            except (ValueError, TypeError):
-                if logger:
-                    logger.debug(f"Skipping product due to price conversion error: {price_str}")
-                continue
-            product_key = (model, storage)
-            # print(product_key)?
-            if product_key in processed_products:
-                if price < processed_products[product_key]['price']:
-                    processed_products[product_key]['price'] = price
-            else:
-                processed_products[product_key] = {}
-                processed_products[product_key]['price'] = price
-        # print(processed_products)
-        processed_products = [{'title': element[0] + " " + element[1], 'price': processed_products[element]['price']} for element in processed_products]
-
-        if logger:
-            logger.info(f"Returned {len(processed_products)} products after cleaning.")
-        return processed_products
+        return min_price_by_product(products, 'Flipkart', 'title', logger)
 
     def quit(self):
         if self.logger:
             self.logger.info("Quitting driver.")
         self.driver.quit()
+        remove_profile(self.user_data_dir)
+        self.user_data_dir = None
 
 class FlipkartLocalScraper(FlipkartScraper):
     def __init__(self, website: str, logger: Optional[logging.Logger] = None):
@@ -137,18 +111,26 @@ class FlipkartServerScraper(FlipkartScraper):
         options = webdriver.ChromeOptions()
         options.add_argument("--incognito")
         service = Service('/usr/bin/chromedriver') # type: ignore
-        options.add_argument("--user-data-dir=/tmp/chrome-user-data")
+        self.user_data_dir = use_private_profile(options)
         options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
         options.add_argument("--headless") # Runs Chrome in headless mode.
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-dev-shm-usage")
         self.driver = webdriver.Chrome(options=options, service = service)
 
-def run(target_machine, _, product_name, logger, website: str = "https://www.flipkart.com/"):
+
+LOCATION_AWARE = False
+
+def get_scraper(target_machine, logger, website: str = "https://www.flipkart.com/"):
     if target_machine == 'local':
-        flipkartSc = FlipkartLocalScraper(website, logger)
-    else:
-        flipkartSc = FlipkartServerScraper(website, logger)
+        return FlipkartLocalScraper(website, logger)
+    return FlipkartServerScraper(website, logger)
+
+def clean(products: list, product_name: str, logger=None) -> list:
+    return FlipkartScraper.clean_product_data(products, logger)
+
+def run(target_machine, _, product_name, logger, website: str = "https://www.flipkart.com/"):
+    flipkartSc = get_scraper(target_machine, logger, website)
     flipkartSc.get_driver()
 
     search_success = flipkartSc.search_product(product_name)
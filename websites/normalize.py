@@ -0,0 +1,101 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+# Title layouts per platform, compiled once. Each yields model, storage and (where listed) variant.
+#   Amazon:   "Apple iPhone 16 (128 GB) - Black"  or  "Apple iPhone 16 128 GB ..."
+#   Flipkart: "Apple iPhone 16 (Black, 128 GB)"
+#   Croma:    "Apple iPhone 16 (128GB, Black)"
+#   Reliance: "Apple iPhone 16 128 GB, Black"
+TITLE_PATTERNS = {
+    'Amazon': re.compile(r'^(?P<model>.*?)\s(?:(?P<storage>\d+\sGB)|(?:\((?P<storage_paren>\d+\sGB)\)))(?:\s*-\s*(?P<variant>[^,(]+))?'),
+    'Flipkart': re.compile(r'(?P<model>.*?)\s\((?P<variant>[^,]+),\s(?P<storage>[^)]+)\)'),
+    'Croma': re.compile(r'(?P<model>.*?)\s\((?P<storage>\d+GB),\s(?P<variant>[^)]+)\)'),
+    'Reliance': re.compile(r'(?P<model>.*?)\s(?P<storage>\d+\sGB),\s(?P<variant>.*)'),
+}
+_STORAGE = re.compile(r'(\d+)\s*GB', re.IGNORECASE)
+_SPACES = re.compile(r'\s+')
+_PRICE_JUNK = re.compile(r'[₹,\s]')
+
+
+class ProductKey(NamedTuple):
+    """Canonical identity of a listing, comparable across platforms."""
+    model: str
+    storage: str
+    variant: str
+
+    @property
+    def title(self) -> str:
+        """The title stored in the products table: model and storage, without the variant."""
+        return f"{self.model} {self.storage}"
+
+
+@lru_cache(maxsize=65536)
+def canonical_key(title: str, platform: str) -> Optional[ProductKey]:
+    """
+    Canonicalizes a listing title into (model, storage, variant), or None if it doesn't parse.
+
+    Memoized: the same titles come back for every city and every day.
+    """
+    match = TITLE_PATTERNS[platform].match(title)
+    if not match:
+        return None
+    groups = match.groupdict()
+    storage = groups.get('storage') or groups.get('storage_paren')
+    if not storage:
+        return None
+    storage = _STORAGE.sub(r'\1 GB', storage.strip())
+    model = _SPACES.sub(' ', groups['model'].replace('Apple', '')).strip()
+    variant = _SPACES.sub(' ', groups.get('variant') or '').strip()
+    return ProductKey(model, storage, variant)
+
+
+def query_title(product: str) -> str:
+    """
+    The title a search query is stored under, e.g. "Apple iPhone 16 128GB" -> "iPhone 16 128 GB".
+
+    Matches `ProductKey.title`, so the products table can be checked for a query before it is scraped.
+    """
+    title = _STORAGE.sub(r'\1 GB', product.replace('Apple', ''))
+    return _SPACES.sub(' ', title).strip()
+
+
+def parse_price(value) -> Optional[int]:
+    """Parses '₹79,900', '79900.00' or 79900 into an int; None for missing, unparseable or zero prices."""
+    if isinstance(value, (int, float)):
+        price = int(value)
+    else:
+        try:
+            price = int(float(_PRICE_JUNK.sub('', str(value))))
+        except ValueError:
+            return None
+    return price or None
+
+
+def min_price_by_product(products: list, platform: str, title_field: str = 'title', logger=None) -> list:
+    """
+    Reduces raw scraped rows to the cheapest listing per (model, storage) in one pass.
+
+    Returns a list of {'title': ..., 'price': ...} dicts in first-seen order.
+    """
+    if logger:
+        logger.info(f"Cleaning {len(products)} products.")
+    cheapest: dict = {}
+    for item in products:
+        key = canonical_key(item.get(title_field) or '', platform)
+        if key is None:
+            if logger:
+                logger.debug(f"Skipping product due to no regex match: {item.get(title_field)}")
+            continue
+        price = parse_price(item.get('price'))
+        if price is None:
+            if logger:
+                logger.debug(f"Skipping product due to price conversion error: {item.get('price')}")
+            continue
+        title = key.title
+        if title not in cheapest or price < cheapest[title]:
+            cheapest[title] = price
+    cleaned_products = [{'title': title, 'price': price} for title, price in cheapest.items()]
+    if logger:
+        logger.info(f"Returned {len(cleaned_products)} products after cleaning.")
+    return cleaned_products
@@ -0,0 +1,90 @@
+import os
+from typing import Optional
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
+# HTML_PARSER picks a backend explicitly; 'auto' takes the fastest one installed.
+DEFAULT_BACKEND = os.getenv('HTML_PARSER', 'auto')
+
+
+def available_backends() -> list:
+    backends = ['html.parser']
+    if HAS_LXML:
+        backends.append('lxml')
+    if HAS_SELECTOLAX:
+        backends.append('selectolax')
+    return backends
+
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    backend = backend or DEFAULT_BACKEND
+    if backend == 'auto':
+        return available_backends()[-1]
+    if backend not in available_backends():
+        raise ValueError(f"HTML parser backend '{backend}' is not installed; available: {available_backends()}")
+    return backend
+
+
+def _cards_bs4(html: str, spec: dict, features: str) -> list:
+    strainer = spec.get('strainer')
+    # Only the result containers (and their contents) are built into the tree.
+    parse_only = SoupStrainer(strainer['name'], attrs=strainer.get('attrs', {})) if strainer else None
+    soup = BeautifulSoup(html, features, parse_only=parse_only)
+    skip = spec.get('skip')
+    rows = []
+    for card in soup.select(spec['container']):
+        if skip and any(skip['text'] in element.get_text() for element in card.select(skip['css'])):
+            continue
+        row = {}
+        for name, field in spec['fields'].items():
+            if field.get('count'):
+                row[name] = len(card.select(field['css']))
+            else:
+                element = card.select_one(field['css'])
+                row[name] = element.get_text().strip() if element else None
+        rows.append(row)
+    return rows
+
+
+def _cards_selectolax(html: str, spec: dict) -> list:
+    tree = LexborHTMLParser(html)
+    skip = spec.get('skip')
+    rows = []
+    for card in tree.css(spec['container']):
+        if skip and any(skip['text'] in element.text() for element in card.css(skip['css'])):
+            continue
+        row = {}
+        for name, field in spec['fields'].items():
+            if field.get('count'):
+                row[name] = len(card.css(field['css']))
+            else:
+                element = card.css_first(field['css'])
+                row[name] = element.text().strip() if element else None
+        rows.append(row)
+    return rows
+
+
+def parse_cards(html: str, spec: dict, backend: Optional[str] = None) -> list:
+    """
+    Parses result cards out of page HTML using a platform's selector spec.
+
+    Returns the same rows as `extract_in_browser`: one dict of raw field
+    values per card. For the BeautifulSoup backends, an optional
+    `spec['strainer']` ({'name': tag, 'attrs': {...}}) restricts parsing to
+    the result containers.
+    """
+    backend = resolve_backend(backend)
+    if backend == 'selectolax':
+        return _cards_selectolax(html, spec)
+    return _cards_bs4(html, spec, backend)
@@ -1,22 +1,40 @@
-from time import sleep
-from random import uniform
+from typing import Optional
 from numpy import nan
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.chrome.service import Service
-from bs4 import BeautifulSoup
 from selenium.webdriver.support import expected_conditions as EC
 import sys
 from selenium import webdriver
-import re
-from collections import defaultdict
+from websites.waits import Waiter
+from websites.session import use_private_profile, remove_profile
+from websites.extract import extract_in_browser
+from websites.parsing import parse_cards
+from websites.normalize import min_price_by_product
+
+WAIT_JITTER = (0.2, 0.6)
+# A card's rating is the number of star icons with a filled path, plus 0.5 for a half star.
+SELECTORS = {
+    'container': 'div.product-card',
+    'strainer': {'name': 'div', 'attrs': {'class': 'product-card'}},
+    'fields': {
+        'name': {'css': 'div.product-card-title'},
+        'price': {'css': 'div.price'},
+        'icons': {'css': 'svg', 'count': True},
+        'stars': {'css': 'svg:has(path[fill="#F7AB20"])', 'count': True},
+        'half_stars': {'css': 'img[alt="star-half"]', 'count': True},
+    },
+}
+RESULTS_SELECTOR = SELECTORS['container']
 
 class RelianceScraper:
     def __init__(self, logger, website: str):
         self.logger = logger
         self.driver: webdriver.Chrome | webdriver.Firefox
+        self.user_data_dir: Optional[str] = None
         self.website = website
+        self.waits = Waiter(self, jitter=WAIT_JITTER, logger=logger)
 
     def change_location(self, pincode: str) -> bool:
         try:
@@ -25,19 +43,19 @@ class RelianceScraper:
             if self.logger:
                 self.logger.error("Error occurred while navigating to Reliance Digital")
             return False
-        sleep(uniform(2, 4))
         try:
+            self.waits.until_ready()
             updates_button = WebDriverWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.ID, 'wzrk-cancel'))
             )
             if updates_button: #type: ignore
                 updates_button.click()
-                sleep(uniform(2, 4))
+                self.waits.until_gone((By.ID, 'wzrk-cancel'))
             pick_location = WebDriverWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.XPATH, '//*[@id="address-pincode-button"]/span'))
             )
             pick_location.click()
-            sleep(uniform(2, 4))
+            self.waits.pause()
         except Exception:
             if self.logger:
                 self.logger.error("Error occurred while finding location bar")
@@ -47,9 +65,10 @@ class RelianceScraper:
                 EC.presence_of_element_located((By.XPATH, '//*[@id="input-pincode"]'))
             )
             pincode_input.send_keys(pincode)
-            sleep(0.2)
+            self.waits.pause()
             pincode_input.send_keys(Keys.ENTER)
-            sleep(uniform(2, 4))
+            self.waits.until_gone((By.XPATH, '//*[@id="input-pincode"]'))
+            self.waits.until_network_idle()
             if self.logger:
                 self.logger.info(f"Successfully changed location to {pincode}")
             return True
@@ -65,9 +84,9 @@ class RelianceScraper:
                 EC.element_to_be_clickable((By.XPATH, '//*[@id="app"]/div/div/div[2]/div/div/div[1]/div/div[2]/div/div/div[1]/div[2]/div/div/div[1]/input'))
             )
             search_bar.click()
-            sleep(uniform(1, 2))
+            self.waits.pause()
             search_bar.send_keys(product_name)
-            sleep(0.4)
+            self.waits.pause()
             search_bar.send_keys(Keys.ENTER)
             if self.logger:
                 self.logger.info(f"Successfully searched for product: {product_name}")
@@ -77,67 +96,40 @@ class RelianceScraper:
                 self.logger.error(f"Error occurred while searching for product {product_name}")
             return False
 
+    @staticmethod
+    def product_from_fields(fields: dict) -> Optional[dict]:
+        """Builds a product row from raw card values, or None if the card has no name or price."""
+        if not fields.get('name') or not fields.get('price'):
+            return None
+        rating: float = fields['stars'] if fields.get('icons') else nan
+        if fields.get('half_stars'):
+            rating += 0.5
+        return {
+            "name": fields['name'],
+            "price": fields['price'],
+            "rating": rating
+        }
+
     def scrape_product_details(self) -> list:
-        sleep(uniform(2, 4))
-        soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-        list_products = []
-        results = soup.find_all("div", class_="product-card") # type: ignore
-        for product in results:
-            name = product.find("div", class_="product-card-title") #type: ignore
-            price = product.find("div", class_="price") #type: ignore
-            rating_re = product.find_all("svg") #type: ignore
-            rating = 0
-            if not rating_re:
-                rating: float = nan
-            else:
-                for ratings in rating_re:
-                    _stars = ratings.find("path", fill="#F7AB20") #type: ignore
-                    if _stars:
-                        rating += 1
-            half_stars = product.find("img", alt="star-half") #type: ignore
-            if half_stars:
-                rating += 0.5
-
-            list_products.append({
-                "name": name.text.strip(), # type: ignore
-                "price": price.text.strip(), # type: ignore
-                "rating": rating # type: ignore
-            })
+        self.waits.until_count_stable(RESULTS_SELECTOR)
+        rows = extract_in_browser(self.driver, SELECTORS, self.logger)
+        if rows is None:
+            rows = parse_cards(self.driver.page_source, SELECTORS)
+        list_products = [product for product in map(self.product_from_fields, rows) if product]
         if self.logger:
             self.logger.info(f"Scraped {len(list_products)} product details")
         return list_products
 
     @staticmethod
     def clean_data(products: list, logger=None):
-        if logger:
-            logger.info(f"Cleaning {len(products)} products.")
-        processed_products = defaultdict(lambda: {'price': float('inf')})
-        for item in products:
-            name = item.get('name', '')
-            price_str = item.get('price', '₹0')
-            match = re.match(r'(.*?)\s(\d+\sGB),\s(.*)', name)
-            if not match:
-                continue
-            model, storage, _ = match.groups()
-            model = model.replace("Apple", "").strip()
-            product_key = (model, storage)
-            try:
-                price = int(float(re.sub(r'[₹,]', '', price_str)))
-            except (ValueError, TypeError):
-                price = 0
-            if price < processed_products[product_key]['price']:
-                processed_products[product_key]['price'] = price
-                processed_products[product_key]['title'] = f"{model} {storage}" # type: ignore
-
-        final_products = [data for data in processed_products.values() if 'title' in data]
-        if logger:
-            logger.info(f"Finished cleaning. Returning {len(final_products)} products.")
-        return final_products
+        return min_price_by_product(products, 'Reliance', 'name', logger)
 
     def quit(self):
         if self.logger:
             self.logger.info("Quitting driver.")
         self.driver.quit()
+        remove_profile(self.user_data_dir)
+        self.user_data_dir = None
 
 
 class RelianceLocalScraper(RelianceScraper):
@@ -164,7 +156,7 @@ class RelianceServerScraper(RelianceScraper):
         options = webdriver.ChromeOptions()
         options.add_argument("--incognito")
         service = Service('/usr/bin/chromedriver') # type: ignore
-        options.add_argument("--user-data-dir=/tmp/chrome-user-data")
+        self.user_data_dir = use_private_profile(options)
         options.add_experimental_option("prefs", {"profile.default_content_setting_values.geolocation": 2})
         options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
         options.add_argument("--headless=new") # Runs Chrome in headless mode.
@@ -172,11 +164,19 @@ class RelianceServerScraper(RelianceScraper):
         options.add_argument("--disable-dev-shm-usage")
         self.driver = webdriver.Chrome(options=options, service = service)
 
-def run(target_machine, pincode, product, logger, website = "https://www.reliancedigital.in/"):
+
+LOCATION_AWARE = True
+
+def get_scraper(target_machine, logger, website: str = "https://www.reliancedigital.in/"):
     if target_machine == 'local':
-        relianceSc = RelianceLocalScraper(logger, website)
-    else:
-        relianceSc = RelianceServerScraper(logger, website)
+        return RelianceLocalScraper(logger, website)
+    return RelianceServerScraper(logger, website)
+
+def clean(products: list, product_name: str, logger=None) -> list:
+    return RelianceScraper.clean_data(products, logger)
+
+def run(target_machine, pincode, product, logger, website = "https://www.reliancedigital.in/"):
+    relianceSc = get_scraper(target_machine, logger, website)
     relianceSc.get_driver()
     location_success = relianceSc.change_location(pincode = pincode)
     if location_success:
@@ -1,17 +1,199 @@
+import json
+import os
+import re
+import sys
+import threading
+from typing import Optional
+import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from websites.reliance.relianceSc import RelianceScraper
+from websites.async_fetch import AsyncFetcher, fan_out
+import timing
 
-response = requests.get("https://www.reliancedigital.in/ext/raven-api/catalog/v1.0/products", params={
-    'page_id':1,
-    'page_size':100,
-    'q':'iPhone 16 256 GB'
-})
-data = response.json()
-items = data.get('items', [])
-for item in items:
-    if item.get('type', 'Unknown') == 'product':
-        product_details = item.get('_custom_json', {})
-        name = product_details.get('name', 'Unknown')
-        type = product_details.get('type', 'Unknown')
-        mrp = product_details.get('mrp', 'Unknown')
-        offer_price = product_details.get('offer_price', 'Unknown')
-        print(f"Name: {name}, Type: {type}, MRP: {mrp}, Offer Price: {offer_price}")
+API_URL = "https://www.reliancedigital.in/ext/raven-api/catalog/v1.0/products"
+# The pincode header below has not been shown to change the API's results, so they are not
+# treated as location-specific: the crawl fetches each product once and fans the rows out.
+LOCATION_AWARE = False
+
+
+def record_name(product_name: str, page_id: int) -> str:
+    """File name a recorded response page is stored under, shared with the stub server."""
+    slug = re.sub(r'[^a-z0-9]+', '-', product_name.lower()).strip('-')
+    return f"{slug}_page{page_id}.json"
+
+
+def request_args(product_name: str, pincode: str, page_id: int, page_size: int) -> dict:
+    return {
+        'params': {'page_id': page_id, 'page_size': page_size, 'q': product_name},
+        # Sent the way the storefront sends it; unverified against a recorded response (see LOCATION_AWARE).
+        'headers': {'x-location-detail': json.dumps({'pincode': str(pincode)})},
+    }
+
+def has_next_page(data: dict, page_products: list) -> bool:
+    return bool(page_products) and data.get('page', {}).get('has_next', False)
+
+
+class RelianceApiScraper:
+    """
+    Reliance Digital scraper backed by the raven catalog API instead of Chrome.
+
+    Attributes:
+        api_url (str): Products endpoint; point it at a local stub server for testing.
+        page_size (int): Items requested per page.
+        max_pages (int): Upper bound on pages fetched per search.
+        timeout (float): Per-request timeout in seconds.
+        record_dir (str): If set, every raw response page is saved here for later replay.
+        logger (logging.Logger): Logger instance for logging messages.
+    """
+    def __init__(self, logger: Optional[logging.Logger] = None, api_url: str = API_URL, page_size: int = 100,
+                 max_pages: int = 5, timeout: float = 15, pool_size: int = 8, record_dir: Optional[str] = None):
+        self.logger = logger
+        self.api_url = api_url
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.record_dir = record_dir
+
+        # One pooled, keep-alive session for every request this scraper makes.
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["GET"])
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "Accept": "application/json",
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+        })
+
+    def fetch_page(self, product_name: str, pincode: str, page_id: int) -> dict:
+        response = self.session.get(
+            self.api_url,
+            timeout=self.timeout,
+            **request_args(product_name, pincode, page_id, self.page_size)
+        )
+        response.raise_for_status()
+        data = response.json()
+        if self.record_dir:
+            os.makedirs(self.record_dir, exist_ok=True)
+            with open(os.path.join(self.record_dir, record_name(product_name, page_id)), 'w') as file:
+                json.dump(data, file)
+        return data
+
+    @staticmethod
+    def parse_items(data: dict) -> list:
+        """
+        Turns one response page into rows shaped like `RelianceScraper.scrape_product_details`.
+        """
+        products = []
+        for item in data.get('items', []):
+            if item.get('type', 'Unknown') != 'product':
+                continue
+            product_details = item.get('_custom_json', {})
+            name = product_details.get('name')
+            offer_price = product_details.get('offer_price', product_details.get('mrp'))
+            if not name or offer_price is None:
+                continue
+            products.append({
+                "name": name,
+                "price": str(offer_price),
+                "rating": None
+            })
+        return products
+
+    def search_product(self, product_name: str, pincode: str) -> list:
+        products = []
+        for page_id in range(1, self.max_pages + 1):
+            try:
+                data = self.fetch_page(product_name, pincode, page_id)
+            except (requests.RequestException, ValueError) as e:
+                if self.logger:
+                    self.logger.error(f"Reliance API request failed for {product_name} page {page_id}: {e}")
+                break
+            page_products = self.parse_items(data)
+            products.extend(page_products)
+            if not has_next_page(data, page_products):
+                break
+        if self.logger:
+            self.logger.info(f"Fetched {len(products)} product details from the Reliance API")
+        return products
+
+    def close(self):
+        self.session.close()
+
+
+_shared_scraper: Optional[RelianceApiScraper] = None
+_shared_lock = threading.Lock()
+
+def shared_scraper(logger=None, api_url: Optional[str] = None) -> RelianceApiScraper:
+    """
+    Returns a process-wide scraper so every task shares one connection pool.
+
+    Deliberately not called get_scraper: the browser modules' get_scraper(target_machine, logger, website)
+    is what SessionPool drives, and this backend is not a browser scraper.
+    """
+    global _shared_scraper
+    with _shared_lock:
+        if _shared_scraper is None:
+            _shared_scraper = RelianceApiScraper(logger, api_url=api_url or os.getenv('RELIANCE_API_URL', API_URL))
+    return _shared_scraper
+
+def run(target_machine, pincode, product, logger, api_url: Optional[str] = None):
+    # target_machine is accepted for parity with relianceSc.run; the API needs no browser.
+    scraper = shared_scraper(logger, api_url)
+    tags = {'platform': 'Reliance', 'pincode': str(pincode), 'product': product}
+    with timing.span('api_fetch', **tags):
+        products = scraper.search_product(product, pincode)
+    if products:
+        with timing.span('clean', **tags):
+            return RelianceScraper.clean_data(products, logger)
+    if logger:
+        logger.warning("No products found, returning empty list.")
+    return []
+
+async def search_product_async(fetcher: AsyncFetcher, product_name: str, pincode: str, api_url: str = API_URL,
+                               page_size: int = 100, max_pages: int = 5) -> list:
+    """Async twin of `RelianceApiScraper.search_product`; errors propagate to the caller."""
+    products = []
+    for page_id in range(1, max_pages + 1):
+        data = await fetcher.get_json(api_url, **request_args(product_name, pincode, page_id, page_size))
+        page_products = RelianceApiScraper.parse_items(data)
+        products.extend(page_products)
+        if not has_next_page(data, page_products):
+            break
+    return products
+
+async def fetch_all(tasks: list, on_result, logger=None, api_url: Optional[str] = None, **fetcher_options) -> dict:
+    """
+    Fetches every (product, pincode) task concurrently and streams cleaned rows to `on_result(task, rows)`.
+
+    `fetcher_options` are passed to AsyncFetcher (rate_per_host, max_in_flight, retries, ...).
+    """
+    api_url = api_url or os.getenv('RELIANCE_API_URL', API_URL)
+    async with AsyncFetcher(logger=logger, **fetcher_options) as fetcher:
+        async def fetch(task):
+            tags = {'platform': task.platform, 'city': task.city, 'pincode': task.pincode, 'product': task.product}
+            # Wall time of the whole paginated search, including waits on the rate limiter.
+            with timing.span('api_fetch', **tags):
+                products = await search_product_async(fetcher, task.product, task.pincode, api_url)
+            if not products:
+                return []
+            with timing.span('clean', **tags):
+                return RelianceScraper.clean_data(products, logger)
+        counts = await fan_out(tasks, fetch, on_result, logger)
+    if logger:
+        logger.info(f"Reliance API fan-out finished: {counts['ok']} ok, {counts['failed']} failed.")
+    return counts
+
+if __name__ == "__main__":
+    # python -m websites.reliance.relianceSc_api [--record DIR] [--url URL]
+    record_dir = None
+    api_url = API_URL
+    if "--record" in sys.argv:
+        record_dir = sys.argv[sys.argv.index("--record") + 1]
+    if "--url" in sys.argv:
+        api_url = sys.argv[sys.argv.index("--url") + 1]
+    scraper = RelianceApiScraper(api_url=api_url, record_dir=record_dir)
+    products = scraper.search_product('iPhone 16 256 GB', '226030')
+    print(RelianceScraper.clean_data(products))
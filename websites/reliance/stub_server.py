@@ -0,0 +1,102 @@
+import json
+import os
+import sys
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from websites.reliance.relianceSc_api import record_name
+
+API_PATH = "/ext/raven-api/catalog/v1.0/products"
+
+
+class _Server(ThreadingHTTPServer):
+    # The default listen backlog of 5 drops connections under a concurrent fan-out.
+    request_queue_size = 256
+
+
+class StubCatalogServer:
+    """
+    Local stand-in for the raven catalog API that replays recorded JSON pages.
+
+    Pages are looked up as `record_name(q, page_id)` inside `record_dir`, which is
+    exactly what `RelianceApiScraper(record_dir=...)` writes. Unknown queries get
+    an empty last page, so a scraper pointed here never hangs or loops.
+
+    Attributes:
+        record_dir (str): Directory holding recorded response pages.
+        host (str): Interface to bind to.
+        port (int): Port to bind to; 0 picks a free one.
+        delay (float): Seconds to sleep before each response, to mimic network latency.
+    """
+    def __init__(self, record_dir: str, host: str = "127.0.0.1", port: int = 0, delay: float = 0.0):
+        self.record_dir = record_dir
+        self.delay = delay
+        self.requests_served = 0
+        self._count_lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out as separate writes; without this, delayed ACKs add ~40 ms per response.
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path != API_PATH:
+                    self.send_error(404)
+                    return
+                query = parse_qs(url.query)
+                body = json.dumps(stub.load_page(query.get('q', [''])[0], int(query.get('page_id', ['1'])[0]))).encode()
+                if stub.delay:
+                    threading.Event().wait(stub.delay)
+                with stub._count_lock:
+                    stub.requests_served += 1
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = _Server((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}{API_PATH}"
+
+    def load_page(self, product_name: str, page_id: int) -> dict:
+        path = os.path.join(self.record_dir, record_name(product_name, page_id))
+        if not os.path.exists(path):
+            return {'items': [], 'page': {'current': page_id, 'has_next': False}}
+        with open(path) as file:
+            return json.load(file)
+
+    def start(self) -> "StubCatalogServer":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    # python -m websites.reliance.stub_server RECORD_DIR [PORT] [DELAY]
+    directory = sys.argv[1] if len(sys.argv) > 1 else "."
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 8765
+    delay = float(sys.argv[3]) if len(sys.argv) > 3 else 0.0
+    stub = StubCatalogServer(directory, port=port, delay=delay)
+    print(f"Serving recorded pages from {directory} at {stub.url}", flush=True)
+    stub.server.serve_forever()
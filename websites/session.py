@@ -0,0 +1,198 @@
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Optional
+import logging
+import timing
+
+
+def use_private_profile(options) -> str:
+    """
+    Points Chrome `options` at a fresh temporary profile directory and returns its path.
+
+    Sessions run side by side on the server, and Chrome instances sharing one
+    profile directory lock each other out. Pass the path to `remove_profile`
+    once the driver has quit.
+    """
+    user_data_dir = tempfile.mkdtemp(prefix="chrome-user-data-")
+    options.add_argument(f"--user-data-dir={user_data_dir}")
+    return user_data_dir
+
+
+def remove_profile(user_data_dir: Optional[str]):
+    """Deletes a profile directory made by `use_private_profile`; a no-op for None."""
+    if user_data_dir:
+        shutil.rmtree(user_data_dir, ignore_errors=True)
+
+
+class ScraperSession:
+    """
+    A long-lived browser session for one platform.
+
+    The driver is started lazily, pointed at a new pincode only when the
+    requested one differs from the current location, and reused for every
+    product searched there. It is recycled after `max_tasks` tasks or as soon
+    as any step fails, so a wedged browser never outlives the task that broke it.
+
+    Each scraper module declares `LOCATION_AWARE`: whether its results depend on
+    the delivery pincode. When it is False the session never calls
+    `change_location`, and the crawl fetches each product once for all cities.
+
+    Attributes:
+        platform (str): Platform name, used in log messages.
+        module: Scraper module exposing `get_scraper`, `clean` and `LOCATION_AWARE`.
+        target_machine (str): 'local' or anything else for the server driver.
+        max_tasks (int): Number of tasks served before the driver is recycled.
+        logger (logging.Logger): Logger instance for logging messages.
+    """
+    def __init__(self, platform: str, module, target_machine: str, max_tasks: int = 20, logger: Optional[logging.Logger] = None):
+        self.platform = platform
+        self.module = module
+        self.target_machine = target_machine
+        self.max_tasks = max(1, max_tasks)
+        self.logger = logger
+        self.scraper = None
+        self.pincode: Optional[str] = None
+        self.tasks_done = 0
+        self._at_home = False
+
+    def _start(self):
+        self.scraper = self.module.get_scraper(self.target_machine, self.logger)
+        self.scraper.get_driver()
+        self.pincode = None
+        self.tasks_done = 0
+        self._at_home = False
+
+    def recycle(self, reason: str = ""):
+        """Quits the current driver, if any. The next task starts a fresh one."""
+        if self.scraper is None:
+            return
+        if self.logger:
+            self.logger.info(f"Recycling {self.platform} session after {self.tasks_done} tasks. {reason}".strip())
+            waits = self.scraper.waits.format_summary()
+            if waits:
+                self.logger.info(f"{self.platform} session waits: {waits}")
+        try:
+            self.scraper.quit()
+        except Exception as e:
+            # Some scrapers already quit the driver themselves when a step fails.
+            if self.logger:
+                self.logger.debug(f"Ignoring error while quitting {self.platform} driver: {e}")
+        self.scraper = None
+        self.pincode = None
+
+    def set_location(self, pincode: str, city: str = '') -> bool:
+        if not self.module.LOCATION_AWARE or self.pincode == pincode:
+            return True
+        with timing.span('change_location', platform=self.platform, city=city, pincode=pincode) as span:
+            located = self.scraper.change_location(pincode) # type: ignore
+            span.ok = bool(located)
+        if not located:
+            return False
+        self.pincode = pincode
+        self._at_home = True
+        return True
+
+    def run(self, pincode: str, product_name: str, city: str = '') -> Optional[list]:
+        """
+        Scrapes one product at one pincode and returns the cleaned rows. `city` only tags timing spans.
+
+        Returns None if the scrape failed (the session is recycled first), so
+        callers can tell a broken driver from a search that found nothing ([]).
+        """
+        tags = {'platform': self.platform, 'city': city, 'pincode': str(pincode), 'product': product_name}
+        try:
+            if self.scraper is None:
+                with timing.span('driver_start', **tags):
+                    self._start()
+            if not self.set_location(str(pincode), city):
+                self.recycle("Location change failed.")
+                return None
+            if self.module.LOCATION_AWARE and not self._at_home:
+                # Search boxes are only guaranteed on the homepage; the location cookie survives the reload.
+                with timing.span('page_fetch', **tags):
+                    self.scraper.driver.get(self.scraper.website) # type: ignore
+                    self.scraper.waits.until_ready() # type: ignore
+            self._at_home = False
+            with timing.span('search_product', **tags) as span:
+                found = self.scraper.search_product(product_name) # type: ignore
+                span.ok = bool(found)
+            if not found:
+                self.recycle("Search failed.")
+                return None
+            with timing.span('scrape_product_details', **tags):
+                products = self.scraper.scrape_product_details() # type: ignore
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"{self.platform} session failed for {product_name} at {pincode}: {e}")
+            self.recycle("Unexpected error.")
+            return None
+
+        self.tasks_done += 1
+        if self.tasks_done >= self.max_tasks:
+            self.recycle("Task limit reached.")
+
+        if products:
+            with timing.span('clean', **tags):
+                return self.module.clean(products, product_name, self.logger)
+        if self.logger:
+            self.logger.warning("No products found, returning empty list.")
+        return []
+
+
+class SessionPool:
+    """
+    A fixed-size pool of ScraperSessions for one platform.
+
+    Checkouts prefer an idle session that is already at the requested pincode,
+    so consecutive products for the same city skip `change_location` entirely.
+    """
+    def __init__(self, platform: str, module, target_machine: str, size: int = 1, max_tasks: int = 20, logger: Optional[logging.Logger] = None):
+        self.platform = platform
+        self.size = max(1, size)
+        self.logger = logger
+        self._factory = lambda: ScraperSession(platform, module, target_machine, max_tasks, logger)
+        self._idle: list = []
+        self._created = 0
+        self._all: list = []
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def session(self, pincode: Optional[str] = None):
+        with self._condition:
+            while not self._idle and self._created >= self.size:
+                self._condition.wait()
+            if self._idle:
+                match = next((s for s in self._idle if s.pincode == pincode), None)
+                session = match or self._idle[-1]
+                self._idle.remove(session)
+            else:
+                session = self._factory()
+                self._all.append(session)
+                self._created += 1
+        try:
+            yield session
+        finally:
+            with self._condition:
+                self._idle.append(session)
+                self._condition.notify()
+
+    def run(self, pincode: str, product_name: str, city: str = '') -> Optional[list]:
+        with self.session(str(pincode)) as session:
+            return session.run(pincode, product_name, city)
+
+    def run_many(self, pincode: str, product_names: list, city: str = ''):
+        """
+        Yields (product_name, rows) for every product, holding a single session throughout
+        so the location is set at most once. rows is None for a product whose scrape failed.
+        """
+        with self.session(str(pincode)) as session:
+            for product_name in product_names:
+                yield product_name, session.run(pincode, product_name, city)
+
+    def close(self):
+        """Quits every driver in the pool."""
+        with self._condition:
+            for session in self._all:
+                session.recycle("Pool closed.")
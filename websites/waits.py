@@ -0,0 +1,142 @@
+import os
+import time
+from collections import defaultdict
+from random import uniform
+from typing import Optional
+import logging
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+# Multiplier for every jitter floor, e.g. WAIT_JITTER_SCALE=0 on a trusted test box.
+JITTER_SCALE = float(os.getenv('WAIT_JITTER_SCALE', '1'))
+
+_RESOURCE_COUNT_JS = "return window.performance.getEntriesByType('resource').length;"
+
+
+class Waiter:
+    """
+    Condition-based waits shared by all scrapers, replacing fixed random sleeps.
+
+    Every wait returns as soon as its condition holds and records how long it
+    actually took, keyed by name, so slow steps show up in `summary()`;
+    ScraperSession logs it each time it recycles the driver. A small
+    per-platform jitter floor can still be applied with `pause()` where a
+    human-like gap between actions matters. By convention each scraper module
+    declares that floor as a module-level WAIT_JITTER = (low, high) and passes
+    it in as `jitter`. Page readiness is never left to the jitter; it is
+    always waited on explicitly.
+
+    Attributes:
+        scraper: Object whose `driver` attribute is the live WebDriver; read on every call so recycled drivers are picked up.
+        jitter (tuple): (low, high) seconds for `pause()`, scaled by WAIT_JITTER_SCALE.
+        timeout (float): Default timeout for every wait.
+        poll (float): Polling interval for the hand-rolled stability checks.
+        logger (logging.Logger): Logger instance for logging messages.
+    """
+    def __init__(self, scraper, jitter: tuple = (0.0, 0.0), timeout: float = 10, poll: float = 0.1, logger: Optional[logging.Logger] = None):
+        self.scraper = scraper
+        self.jitter = jitter
+        self.timeout = timeout
+        self.poll = poll
+        self.logger = logger
+        self.timings: dict = defaultdict(list)
+
+    @property
+    def driver(self):
+        return self.scraper.driver
+
+    def _record(self, name: str, start: float):
+        elapsed = time.perf_counter() - start
+        self.timings[name].append(elapsed)
+        if self.logger:
+            self.logger.debug(f"Wait '{name}' took {elapsed:.3f}s")
+
+    def pause(self, low: Optional[float] = None, high: Optional[float] = None):
+        """Sleeps for the platform's jitter floor, or for an explicit (low, high) range."""
+        low = self.jitter[0] if low is None else low
+        high = self.jitter[1] if high is None else high
+        if high * JITTER_SCALE > 0:
+            start = time.perf_counter()
+            time.sleep(uniform(low, high) * JITTER_SCALE)
+            self._record('pause', start)
+
+    def until(self, condition, name: str, timeout: Optional[float] = None):
+        """Runs a WebDriverWait on any expected condition and records its duration."""
+        start = time.perf_counter()
+        try:
+            return WebDriverWait(self.driver, timeout or self.timeout, poll_frequency=self.poll).until(condition)
+        finally:
+            self._record(name, start)
+
+    def until_present(self, locator: tuple, timeout: Optional[float] = None):
+        return self.until(EC.presence_of_element_located(locator), 'present', timeout)
+
+    def until_clickable(self, locator: tuple, timeout: Optional[float] = None):
+        return self.until(EC.element_to_be_clickable(locator), 'clickable', timeout)
+
+    def until_gone(self, locator: tuple, timeout: Optional[float] = None) -> bool:
+        """Waits for a dialog or input to disappear; returns False instead of raising on timeout."""
+        try:
+            self.until(EC.invisibility_of_element_located(locator), 'gone', timeout)
+            return True
+        except TimeoutException:
+            return False
+
+    def until_ready(self, timeout: Optional[float] = None):
+        """Waits for document.readyState to reach 'complete'."""
+        return self.until(lambda driver: driver.execute_script("return document.readyState") == "complete", 'ready', timeout)
+
+    def _until_stable(self, name: str, read, settle: float, timeout: Optional[float]) -> int:
+        # Polls `read()` until it has returned the same value for `settle` seconds.
+        start = time.perf_counter()
+        deadline = start + (timeout or self.timeout)
+        last = read()
+        stable_since = time.perf_counter()
+        while time.perf_counter() < deadline:
+            time.sleep(self.poll)
+            current = read()
+            if current != last:
+                last = current
+                stable_since = time.perf_counter()
+            elif time.perf_counter() - stable_since >= settle:
+                break
+        self._record(name, start)
+        return last
+
+    def until_network_idle(self, settle: float = 0.5, timeout: Optional[float] = None) -> int:
+        """Waits until no new resources have been fetched for `settle` seconds."""
+        return self._until_stable('network_idle', lambda: self.driver.execute_script(_RESOURCE_COUNT_JS), settle, timeout)
+
+    def until_count_stable(self, css_selector: str, settle: float = 0.5, minimum: int = 1, timeout: Optional[float] = None) -> int:
+        """
+        Waits for at least `minimum` elements matching `css_selector`, then until
+        their count stops changing for `settle` seconds. Returns the final count.
+        """
+        count_js = f"return document.querySelectorAll({css_selector!r}).length;"
+        start = time.perf_counter()
+        try:
+            WebDriverWait(self.driver, timeout or self.timeout, poll_frequency=self.poll).until(
+                lambda driver: driver.execute_script(count_js) >= minimum
+            )
+        except TimeoutException:
+            self._record('results', start)
+            return 0
+        remaining = max(self.poll, (timeout or self.timeout) - (time.perf_counter() - start))
+        count = self._until_stable('results_settle', lambda: self.driver.execute_script(count_js), settle, remaining)
+        self._record('results', start)
+        return count
+
+    def summary(self) -> dict:
+        """Per-wait-name count, total and max seconds."""
+        return {
+            name: {'count': len(values), 'total': sum(values), 'max': max(values)}
+            for name, values in self.timings.items() if values
+        }
+
+    def format_summary(self) -> str:
+        """`summary()` as a single log line, slowest wait first."""
+        return ', '.join(
+            f"{name} {stats['count']}x {stats['total']:.2f}s (max {stats['max']:.2f}s)"
+            for name, stats in sorted(self.summary().items(), key=lambda item: -item[1]['total'])
+        )